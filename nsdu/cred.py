@@ -10,6 +10,11 @@ from nsdu.config import Config
 from nsdu.exceptions import UserError
 from nsdu.loader_managers import CredLoaderManager, LoaderManagerBuilder
 
+WRONG_AUTOLOGIN_CODE_MESSAGE = (
+    'Could not log in to the nation "{}" with that autologin code '
+    "(use --add-password if you are adding passwords)."
+)
+
 
 class CredFeature(feature.Feature):
     """Handles the nation login credential feature."""
@@ -93,10 +98,7 @@ class CredFeature(feature.Feature):
         if is_correct:
             self.cred_loader_manager.add_cred(nation_name, autologin_code)
         else:
-            raise UserError(
-                f'Could not log in to the nation "{nation_name}" with that '
-                f"autologin code (use --add-password if you are adding passwords)."
-            )
+            raise UserError(WRONG_AUTOLOGIN_CODE_MESSAGE.format(nation_name))
 
     def add_autologin_creds(self, creds: Mapping[str, str]) -> None:
         """Add autologin code credentials.
@@ -105,8 +107,11 @@ class CredFeature(feature.Feature):
             creds (Mapping[str, str]): Autologin code keyed by nation name
         """
 
-        for nation_name, password in creds.items():
-            self.add_password_cred(nation_name, password)
+        verify_results = self.auth_api.verify_autologin_codes(creds)
+        for nation_name, autologin_code in creds.items():
+            if not verify_results[nation_name]:
+                raise UserError(WRONG_AUTOLOGIN_CODE_MESSAGE.format(nation_name))
+            self.cred_loader_manager.add_cred(nation_name, autologin_code)
 
     def remove_cred(self, nation_name: str) -> None:
         """Remove a login credential.
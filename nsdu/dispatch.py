@@ -35,10 +35,7 @@ def group_dispatches_by_owner_nation(
 
     groups: dict[str, DispatchesMetadata] = {}
     for name, metadata in dispatches_metadata.items():
-        nation = metadata.owner_nation
-        if nation not in groups:
-            groups[nation] = {}
-        groups[nation][name] = metadata
+        groups.setdefault(metadata.owner_nation, {})[name] = metadata
     return groups
 
 
@@ -30,7 +30,11 @@ class DispatchOp(Enum):
     DELETE = 3
 
 
-@dataclass(frozen=True)
+# Dispatch operations keyed by the names used in loader sources
+DISPATCH_OPS_BY_NAME = {op.name.lower(): op for op in DispatchOp}
+
+
+@dataclass(frozen=True, slots=True)
 class DispatchMetadata:
     """Contains the metadata of a dispatch."""
 
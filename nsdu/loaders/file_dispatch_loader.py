@@ -11,7 +11,12 @@ import toml
 import nsdu
 from nsdu import loader_api
 from nsdu.config import Config
-from nsdu.loader_api import DispatchesMetadata, DispatchMetadata, DispatchOp
+from nsdu.loader_api import (
+    DISPATCH_OPS_BY_NAME,
+    DispatchesMetadata,
+    DispatchMetadata,
+    DispatchOp,
+)
 
 DEFAULT_EXT = ".txt"
 
@@ -36,22 +41,16 @@ def parse_dispatch_metadata_dict(
     """
 
     try:
-        operation = metadata_dict["op"]
+        operation_name = metadata_dict["op"]
         title = metadata_dict["title"]
         category = metadata_dict["category"]
         subcategory = metadata_dict["subcategory"]
     except KeyError as err:
         raise ValueError(f"{err.args[0]} is missing")
 
-    match operation:
-        case "create":
-            operation = DispatchOp.CREATE
-        case "edit":
-            operation = DispatchOp.EDIT
-        case "delete":
-            operation = DispatchOp.DELETE
-        case _:
-            raise ValueError(f'Invalid operation "{operation}"')
+    operation = DISPATCH_OPS_BY_NAME.get(operation_name)
+    if operation is None:
+        raise ValueError(f'Invalid operation "{operation_name}"')
 
     ns_id: str | None = None
     if operation != DispatchOp.CREATE:
@@ -133,7 +132,7 @@ def get_new_metadata_dict(old_dict: dict, new_dispatch_id: str | None) -> dict:
 
     new_dict = old_dict.copy()
     new_dict["ns_id"] = new_dispatch_id
-    new_dict["op"] = "edit"
+    new_dict["op"] = DispatchOp.EDIT.name.lower()
     return new_dict
 
 
@@ -4,22 +4,27 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import itertools
 import logging
 import re
+import threading
 from abc import ABC, abstractmethod
-from collections import UserDict
+from collections import UserDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Mapping, Sequence
+from typing import Any, Callable, ClassVar, Iterator, Mapping, Sequence
 
+import google_auth_httplib2
 from google.oauth2 import service_account
 from googleapiclient import discovery
-from googleapiclient.http import HttpError
+from googleapiclient.http import HttpError, build_http
 
 from nsdu import loader_api
 from nsdu.config import Config
 from nsdu.loader_api import (
+    DISPATCH_OPS_BY_NAME,
     DispatchesMetadata,
     DispatchMetadata,
     DispatchOp,
@@ -28,51 +33,114 @@ from nsdu.loader_api import (
 )
 
 GOOGLE_API_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-
-HYPERLINK_PATTERN = (
-    r'=hyperlink\("https://www.nationstates.net/page=dispatch/id=(\d+)",\s*"(.+)"\)'
-)
-HYPERLINK_FORMAT = (
-    '=hyperlink("https://www.nationstates.net/page=dispatch/id={dispatch_id}","{name}")'
+# Google Sheets API quota allows some concurrent requests per user
+MAX_CONCURRENT_REQUESTS = 8
+# Retries wait up to 2, 4, 8, 16 and 32 seconds
+MAX_REQUEST_RETRIES = 5
+
+# Name group also accepts quotes escaped as "" without backtracking over the cell
+HYPERLINK_REGEX = re.compile(
+    r'=hyperlink\("https://www\.nationstates\.net/page=dispatch/id=(\d+)",'
+    r'\s*"((?:[^"]|"")+)"\)',
+    flags=re.IGNORECASE,
 )
+A1_CELL_REGEX = re.compile(r"([A-Za-z]+)(\d*)")
 
-
-SUCCESS_RESULT_MESSAGE_FORMAT = "{message}\nTime: {result_time}"
 SUCCESS_RESULT_MESSAGES = {
     DispatchOp.CREATE: "Created successfully.",
     DispatchOp.EDIT: "Edited successfully.",
     DispatchOp.DELETE: "Deleted successfully.",
 }
-FAILURE_RESULT_MESSAGE_FORMAT = (
-    "{message}\nDetails: {failure_details}\nTime: {result_time}"
-)
 FAILURE_RESULT_MESSAGES = {
     DispatchOp.CREATE: "Failed to create.",
     DispatchOp.EDIT: "Failed to edit.",
     DispatchOp.DELETE: "Failed to remove.",
 }
-INVALID_OPERATION_MESSAGE = "Invalid operation {operation}"
 RESULT_TIME_FORMAT = "%Y/%m/%d %H:%M:%S %Z"
 
 logger = logging.getLogger(__name__)
 
+HttpFactory = Callable[[], Any]
 CellValue = Any
 RowCellValues = list[CellValue]
 RangeCellValues = list[RowCellValues]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SheetRange:
     """Describes the spreadsheet ID and range value of a spreadsheet range."""
 
     spreadsheet_id: str
     range_value: str
 
+    def get_row_range(
+        self, row_pos: int, first_col_pos: int, last_col_pos: int
+    ) -> SheetRange:
+        """Get the A1 range of some cells on a row of this range.
+        A single cell gets a single-cell reference such as "Sheet!G5".
+
+        Args:
+            row_pos (int): Row position from the start of this range
+            first_col_pos (int): First column position from the start of this range
+            last_col_pos (int): Last column position from the start of this range
+
+        Returns:
+            SheetRange: Range of the cells
+        """
+
+        sheet_name, separator, cells = self.range_value.rpartition("!")
+        start_cell = A1_CELL_REGEX.fullmatch(cells.split(":")[0])
+        if start_cell is None:
+            raise ValueError(f'Invalid A1 range "{self.range_value}"')
+
+        start_col = column_letter_to_index(start_cell.group(1))
+        row_number = int(start_cell.group(2) or 1) + row_pos
+        first_col = column_index_to_letter(start_col + first_col_pos)
+        last_col = column_index_to_letter(start_col + last_col_pos)
+        cells = f"{first_col}{row_number}"
+        if last_col != first_col:
+            cells = f"{cells}:{last_col}{row_number}"
+        return SheetRange(self.spreadsheet_id, f"{sheet_name}{separator}{cells}")
+
+
+def column_letter_to_index(letter: str) -> int:
+    """Convert A1 column letters into a zero-based column index.
+
+    Args:
+        letter (str): Column letters
+
+    Returns:
+        int: Column index
+    """
+
+    index = 0
+    for char in letter.upper():
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index - 1
+
+
+def column_index_to_letter(index: int) -> str:
+    """Convert a zero-based column index into A1 column letters.
+
+    Args:
+        index (int): Column index
+
+    Returns:
+        str: Column letters
+    """
+
+    letter = ""
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letter = chr(ord("A") + remainder) + letter
+    return letter
+
 
 MultiRangeCellValues = dict[SheetRange, RangeCellValues]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dispatch(loader_api.DispatchMetadata):
     template: str
 
@@ -103,17 +171,48 @@ class GoogleSheetsApiAdapter:
 
     Args:
         api (Any): Google Sheets API client object
+        http_factory (HttpFactory | None): Callback to create a new authorized
+        HTTP object. Requests to many spreadsheets are executed concurrently
+        if provided since HTTP objects cannot be shared between threads.
+        max_workers (int): Maximum number of concurrent requests
     """
 
-    def __init__(self, api: Any):
+    def __init__(
+        self,
+        api: Any,
+        http_factory: HttpFactory | None = None,
+        max_workers: int = MAX_CONCURRENT_REQUESTS,
+    ):
         self._api = api
+        self._http_factory = http_factory
+        self._max_workers = max_workers
+        # Worker threads and their HTTP objects are kept to reuse connections
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread_local = threading.local()
+
+    def _get_thread_http(self) -> Any:
+        """Get the HTTP object of the current thread, creating it if needed.
+
+        Returns:
+            Any: HTTP object
+        """
+
+        http = getattr(self._thread_local, "http", None)
+        if http is None:
+            assert self._http_factory is not None
+            http = self._http_factory()
+            self._thread_local.http = http
+        return http
 
     @staticmethod
-    def execute(request: Any) -> Any:
+    def execute(request: Any, http: Any = None) -> Any:
         """Execute a request from the Google Sheets API client.
+        Transient errors are retried before giving up.
 
         Args:
             request (Any): Request from the Google Sheets API client
+            http (Any): HTTP object to execute the request with.
+            Use the client's HTTP object if None.
 
         Raises:
             GoogleApiError: API error
@@ -123,67 +222,96 @@ class GoogleSheetsApiAdapter:
         """
 
         try:
-            return request.execute()
+            # The client retries 429, 5xx and connection errors
+            # with randomized exponential backoff
+            if http is None:
+                return request.execute(num_retries=MAX_REQUEST_RETRIES)
+            return request.execute(http=http, num_retries=MAX_REQUEST_RETRIES)
         except HttpError as err:
             raise GoogleApiError(err.status_code, err.error_details) from err
 
-    def get_values_of_ranges(
+    def execute_many(self, requests: Sequence[Any]) -> list[Any]:
+        """Execute many requests from the Google Sheets API client,
+        concurrently if possible.
+
+        Args:
+            requests (Sequence[Any]): Requests from the Google Sheets API client
+
+        Raises:
+            GoogleApiError: API error
+
+        Returns:
+            list[Any]: API responses in the same order as the requests
+        """
+
+        if self._http_factory is None or len(requests) < 2:
+            return [GoogleSheetsApiAdapter.execute(req) for req in requests]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        return list(
+            self._executor.map(
+                lambda req: GoogleSheetsApiAdapter.execute(
+                    req, self._get_thread_http()
+                ),
+                requests,
+            )
+        )
+
+    def close(self) -> None:
+        """Shut down worker threads used for concurrent requests."""
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def get_values_of_ranges_in_order(
         self, sheet_ranges: Sequence[SheetRange]
-    ) -> dict[SheetRange, RangeCellValues]:
-        """Get cell values of many spreadsheet ranges.
+    ) -> list[tuple[SheetRange, RangeCellValues]]:
+        """Get cell values of many spreadsheet ranges in the order of the ranges.
+        Ranges returned by the API are normalized and may differ from the
+        requested ones, so callers can use the order to match them instead.
 
         Args:
             sheet_ranges (Sequence[SheetRange]): Ranges to get
 
         Returns:
-            dict[SheetRange, SheetRangeValues]: Cell values
+            list[tuple[SheetRange, RangeCellValues]]: Ranges returned by the API
+            and their cell values
         """
 
-        spreadsheets_cell_values: dict[SheetRange, RangeCellValues] = {}
+        # Ranges of the same spreadsheet may not be next to each other
+        spreadsheets: defaultdict[str, list[int]] = defaultdict(list)
+        for i, sheet_range in enumerate(sheet_ranges):
+            spreadsheets[sheet_range.spreadsheet_id].append(i)
 
-        spreadsheets = itertools.groupby(
-            sheet_ranges, lambda range: range.spreadsheet_id
-        )
-        for spreadsheet_id, spreadsheet_ranges in spreadsheets:
-            range_values = list(
-                map(lambda sheet_range: sheet_range.range_value, spreadsheet_ranges)
-            )
-
-            req = self._api.batchGet(
+        reqs = [
+            self._api.batchGet(
                 spreadsheetId=spreadsheet_id,
-                ranges=range_values,
+                ranges=[sheet_ranges[i].range_value for i in range_indexes],
                 valueRenderOption="FORMULA",
             )
-            resp = GoogleSheetsApiAdapter.execute(req)
+            for spreadsheet_id, range_indexes in spreadsheets.items()
+        ]
+        resps = self.execute_many(reqs)
+
+        results: list[Any] = [None] * len(sheet_ranges)
+        for (spreadsheet_id, range_indexes), resp in zip(spreadsheets.items(), resps):
             logger.debug(
                 'Pulled cell values from ranges "%r" of spreadsheet "%s": "%r"',
-                range_values,
+                [sheet_ranges[i].range_value for i in range_indexes],
                 spreadsheet_id,
                 resp,
             )
 
-            cell_values = {
-                SheetRange(spreadsheet_id, valueRange["range"]): valueRange.get(
-                    "values", []
+            # Value ranges are returned in the same order as the requested ranges
+            for i, value_range in zip(range_indexes, resp["valueRanges"]):
+                results[i] = (
+                    SheetRange(spreadsheet_id, value_range["range"]),
+                    value_range.get("values", []),
                 )
-                for valueRange in resp["valueRanges"]
-            }
-            spreadsheets_cell_values.update(cell_values)
-
-        return spreadsheets_cell_values
-
-    def get_values_of_range(self, sheet_range: SheetRange) -> RangeCellValues:
-        """Get cell values of a spreadsheet range.
-
-        Args:
-            sheet_range (CellRange): Range to get
-
-        Returns:
-            RangeCellValues: Cell values
-        """
 
-        result = self.get_values_of_ranges([sheet_range])
-        return next(iter(result.values()))
+        return results
 
     def update_values_of_ranges(
         self, new_values: Mapping[SheetRange, RangeCellValues]
@@ -194,35 +322,42 @@ class GoogleSheetsApiAdapter:
             new_values (Mapping[SheetRange, RangeCellValues]): New cell values
         """
 
-        spreadsheets = itertools.groupby(
-            new_values.keys(), lambda range: range.spreadsheet_id
-        )
-        for spreadsheet_id, spreadsheet_ranges in spreadsheets:
-            spreadsheet_new_values = list(
-                map(
-                    lambda range: {
-                        "range": range.range_value,
-                        "majorDimension": "ROWS",
-                        "values": new_values[range],
-                    },
-                    spreadsheet_ranges,
-                )
+        spreadsheets: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+        for sheet_range, range_new_values in new_values.items():
+            # Major dimension is omitted since rows are the API's default
+            spreadsheets[sheet_range.spreadsheet_id].append(
+                {"range": sheet_range.range_value, "values": range_new_values}
+            )
+
+        reqs = [
+            self._api.batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={
+                    "valueInputOption": "USER_ENTERED",
+                    "data": spreadsheet_new_values,
+                },
             )
-            body = {"valueInputOption": "USER_ENTERED", "data": spreadsheet_new_values}
-            req = self._api.batchUpdate(spreadsheetId=spreadsheet_id, body=body)
-            resp = GoogleSheetsApiAdapter.execute(req)
+            for spreadsheet_id, spreadsheet_new_values in spreadsheets.items()
+        ]
+        resps = self.execute_many(reqs)
+
+        for (spreadsheet_id, spreadsheet_new_values), resp in zip(
+            spreadsheets.items(), resps
+        ):
             logger.debug(
                 'Updated cell values of ranges "%r" from spreadsheet "%s": %r',
-                spreadsheet_ranges,
+                [data["range"] for data in spreadsheet_new_values],
                 spreadsheet_id,
                 resp,
             )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OpResult(ABC):
     """Describes the result of a dispatch operation."""
 
+    is_failure: ClassVar[bool] = False
+
     dispatch_name: str
     operation: DispatchOp
     result_time: datetime
@@ -237,7 +372,7 @@ class OpResult(ABC):
         """
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SuccessOpResult(OpResult):
     """Describes the result of a successful dispatch operation."""
 
@@ -245,15 +380,15 @@ class SuccessOpResult(OpResult):
     def result_message(self) -> str:
         result_message = SUCCESS_RESULT_MESSAGES[self.operation]
         result_time_str = self.result_time.strftime(RESULT_TIME_FORMAT)
-        return SUCCESS_RESULT_MESSAGE_FORMAT.format(
-            message=result_message, result_time=result_time_str
-        )
+        return f"{result_message}\nTime: {result_time_str}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FailureOpResult(OpResult):
     """Describes the result of a failed dispatch operation."""
 
+    is_failure: ClassVar[bool] = True
+
     operation: DispatchOp | str
     details: str | None
 
@@ -262,14 +397,10 @@ class FailureOpResult(OpResult):
         result_message = (
             FAILURE_RESULT_MESSAGES[self.operation]
             if isinstance(self.operation, DispatchOp)
-            else INVALID_OPERATION_MESSAGE.format(operation=self.operation)
+            else f"Invalid operation {self.operation}"
         )
         result_time_str = self.result_time.strftime(RESULT_TIME_FORMAT)
-        return FAILURE_RESULT_MESSAGE_FORMAT.format(
-            message=result_message,
-            failure_details=self.details,
-            result_time=result_time_str,
-        )
+        return f"{result_message}\nDetails: {self.details}\nTime: {result_time_str}"
 
 
 class OpResultStore(UserDict[str, OpResult]):
@@ -324,7 +455,7 @@ class OpResultStore(UserDict[str, OpResult]):
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CategorySetup:
     """Describes a dispatch category/subcategory setup."""
 
@@ -349,14 +480,13 @@ class CategorySetupStore(UserDict[str, CategorySetup]):
         setups: dict[str, CategorySetup] = {}
         # In case of similar IDs, the latest one is used
         for row in range_cell_values:
-            setup_id = str(row[0])
-            category_name = str(row[1]).lower()
-            subcategory_name = str(row[2]).lower()
-
+            setup_id, category_name, subcategory_name = get_row_cell_strs(row, 3)
             if not category_name or not subcategory_name:
                 continue
 
-            setups[setup_id] = CategorySetup(category_name, subcategory_name)
+            setups[setup_id] = CategorySetup(
+                category_name.lower(), subcategory_name.lower()
+            )
 
         return cls(setups)
 
@@ -367,12 +497,12 @@ class CategorySetupStore(UserDict[str, CategorySetup]):
             raise KeyError(f"Could not find category setup ID {setup_id}") from err
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OwnerNation:
     """Describes a dispatch owner nation and its allowed spreadsheets."""
 
     nation_name: str
-    allowed_spreadsheet_ids: list[str]
+    allowed_spreadsheet_ids: frozenset[str]
 
 
 class OwnerNationStore(UserDict[str, OwnerNation]):
@@ -392,17 +522,16 @@ class OwnerNationStore(UserDict[str, OwnerNation]):
         owner_nations: dict[str, OwnerNation] = {}
         # If there are similar IDs, the latest one is used
         for row in range_cell_values:
-            owner_id = str(row[0])
-
-            owner_nation_name = str(row[1])
+            owner_id, owner_nation_name, allowed_spreadsheets_cell = get_row_cell_strs(
+                row, 3
+            )
             if not owner_nation_name:
                 continue
 
-            allowed_spreadsheets_cell = str(row[2])
-            if not allowed_spreadsheets_cell:
-                allowed_spreadsheets = []
-            else:
-                allowed_spreadsheets = str(row[2]).split(",")
+            # Blank entries from stray commas are dropped
+            allowed_spreadsheets = frozenset(
+                filter(None, map(str.strip, allowed_spreadsheets_cell.split(",")))
+            )
 
             owner_nations[owner_id] = OwnerNation(
                 owner_nation_name, allowed_spreadsheets
@@ -429,13 +558,32 @@ class OwnerNationStore(UserDict[str, OwnerNation]):
             bool: True if allowed
         """
 
-        if owner_id not in self.data:
+        owner_nation = self.data.get(owner_id)
+        if owner_nation is None:
             raise KeyError(f'Could not find any nation with owner ID "{owner_id}"')
 
-        return spreadsheet_id in self.data[owner_id].allowed_spreadsheet_ids
+        return spreadsheet_id in owner_nation.allowed_spreadsheet_ids
+
+
+def get_row_cell_strs(resp: RowCellValues, width: int) -> list[str]:
+    """Get the first cells of a row as strings. Missing cells
+    of a short row are filled with empty strings.
+
+    Args:
+        resp (RowCellValues): Row cell values in Sheets API format
+        width (int): Number of cells to get
+
+    Returns:
+        list[str]: Cell values
+    """
+
+    # Most cells are already strings so skip converting them
+    cells = [value if type(value) is str else str(value) for value in resp[:width]]
+    cells.extend([""] * (width - len(cells)))
+    return cells
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UtilityTemplateRow:
     """Contains cell values of a utility template sheet row."""
 
@@ -454,32 +602,26 @@ class UtilityTemplateRow:
             UtilityTemplateRow: Utility template row object
         """
 
-        name = template = ""
-        try:
-            name = str(resp[0])
-            template = str(resp[1])
-        except IndexError:
-            pass
+        name, template = get_row_cell_strs(resp, 2)
         return cls(name, template)
 
     @staticmethod
-    def get_many_from_api(
-        api: GoogleSheetsApiAdapter, sheet_ranges: Sequence[SheetRange]
+    def from_api_values(
+        values: Mapping[SheetRange, RangeCellValues],
     ) -> list[UtilityTemplateRow]:
-        """Get utility template row objects from many spreadsheet ranges
-        using the Sheets API.
+        """Get utility template row objects from cell values of many ranges.
 
         Args:
-            api (GoogleSheetsApiAdapter): Sheets API client
-            sheet_ranges (Sequence[SheetRange]): Ranges to load
+            values (Mapping[SheetRange, RangeCellValues]): Cell values
 
         Returns:
             list[UtilityTemplateRow]: Utility template row objects
         """
 
-        values = api.get_values_of_ranges(sheet_ranges).values()
         return [
-            UtilityTemplateRow.from_api_row(row) for range in values for row in range
+            UtilityTemplateRow.from_api_row(row)
+            for range in values.values()
+            for row in range
         ]
 
 
@@ -498,6 +640,25 @@ def parse_utility_template_sheet_rows(
     return {row.name: row.template for row in rows if row.name and row.template}
 
 
+@functools.lru_cache(maxsize=4096)
+def parse_hyperlink(cell_value: str) -> tuple[str | None, str]:
+    """Parse the HYPERLINK function in the dispatch name cell.
+    Results are cached since a cell is parsed for both its name and ID.
+
+    Args:
+        cell_value (str): Dispatch name cell value
+
+    Returns:
+        tuple[str | None, str]: Dispatch ID and dispatch name
+    """
+
+    result = HYPERLINK_REGEX.match(cell_value)
+    if result is None:
+        return None, cell_value
+
+    return result.group(1), result.group(2)
+
+
 def extract_dispatch_id_from_hyperlink(cell_value: str) -> str | None:
     """Extract dispatch ID from the HYPERLINK function in the dispatch name cell.
 
@@ -508,11 +669,7 @@ def extract_dispatch_id_from_hyperlink(cell_value: str) -> str | None:
         str | None: Dispatch ID
     """
 
-    result = re.search(HYPERLINK_PATTERN, cell_value, flags=re.IGNORECASE)
-    if result is None:
-        return None
-
-    return result.group(1)
+    return parse_hyperlink(cell_value)[0]
 
 
 def extract_name_from_hyperlink(cell_value: str) -> str:
@@ -525,11 +682,7 @@ def extract_name_from_hyperlink(cell_value: str) -> str:
         str: Dispatch name
     """
 
-    result = re.search(HYPERLINK_PATTERN, cell_value, flags=re.IGNORECASE)
-    if result is None:
-        return cell_value
-
-    return result.group(2)
+    return parse_hyperlink(cell_value)[1]
 
 
 def create_hyperlink(name: str, dispatch_id: str) -> str:
@@ -543,7 +696,10 @@ def create_hyperlink(name: str, dispatch_id: str) -> str:
         str: Hyperlink function
     """
 
-    return HYPERLINK_FORMAT.format(name=name, dispatch_id=dispatch_id)
+    return (
+        f'=hyperlink("https://www.nationstates.net/page=dispatch/id={dispatch_id}",'
+        f'"{name}")'
+    )
 
 
 class InvalidDispatchRowError(GoogleDispatchLoaderError):
@@ -554,11 +710,7 @@ class InvalidDispatchRowError(GoogleDispatchLoaderError):
         self.operation = operation
 
 
-class SkipRow(GoogleDispatchLoaderError):
-    """Exception for dispatch sheet rows to skip when processing."""
-
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DispatchRow:
     """Contains cell values of a dispatch sheet row."""
 
@@ -581,66 +733,26 @@ class DispatchRow:
             DispatchRow: Dispatch row object
         """
 
-        dispatch_name = (
-            operation
-        ) = owner_nation = category_setup = title = template = status = ""
-        try:
-            dispatch_name = str(resp[0])
-            operation = str(resp[1])
-            owner_nation = str(resp[2])
-            category_setup = str(resp[3])
-            title = str(resp[4])
-            template = str(resp[5])
-            status = str(resp[6])
-        except IndexError:
-            pass
-        return cls(
-            dispatch_name,
-            operation,
-            owner_nation,
-            category_setup,
-            title,
-            template,
-            status,
-        )
+        return cls(*get_row_cell_strs(resp, 7))
 
     @staticmethod
-    def get_many_from_api(
-        api: GoogleSheetsApiAdapter, sheet_ranges: Sequence[SheetRange]
+    def from_api_values(
+        values: Mapping[SheetRange, RangeCellValues],
     ) -> dict[SheetRange, DispatchRows]:
-        """Get dispatch row objects from many spreadsheet ranges using the Sheets API.
+        """Get dispatch row objects from cell values of many ranges.
 
         Args:
-            api (GoogleSheetsApiAdapter): Sheets API
-            sheet_ranges (Sequence[SheetRange]): Ranges to get
+            values (Mapping[SheetRange, RangeCellValues]): Cell values
 
         Returns:
             dict[SheetRange, DispatchRows]: Dispatch row objects
         """
 
-        resp = api.get_values_of_ranges(sheet_ranges)
         return {
             range: [DispatchRow.from_api_row(row) for row in rows]
-            for range, rows in resp.items()
+            for range, rows in values.items()
         }
 
-    def to_cell_values(self) -> RowCellValues:
-        """Get cell values of this row in Sheets API format.
-
-        Returns:
-            RowCellValues: Row cell values in Sheets API format
-        """
-
-        return [
-            self.hyperlink,
-            self.operation,
-            self.owner_id,
-            self.category_setup_id,
-            self.title,
-            self.template,
-            self.status,
-        ]
-
 
 DispatchRows = Sequence[DispatchRow]
 
@@ -650,7 +762,7 @@ def parse_dispatch_cell_values_of_row(
     spreadsheet_id: str,
     owner_nations: OwnerNationStore,
     category_setups: CategorySetupStore,
-) -> Dispatch:
+) -> Dispatch | None:
     """Parse a dispatch sheet row's cell values
     and return a Dispatch object.
 
@@ -661,37 +773,32 @@ def parse_dispatch_cell_values_of_row(
         category_setups (CategorySetupData): Category setup data
 
     Raises:
-        SkipRow: This row must be skipped
         InvalidDispatchDataError: This row has invalid values
 
     Returns:
-        Dispatch: Dispatch object
+        Dispatch | None: Dispatch object. None if this row must be skipped
     """
 
-    if not row.hyperlink:
-        raise SkipRow
-    dispatch_id = extract_dispatch_id_from_hyperlink(str(row.hyperlink))
-
-    if not row.operation:
-        raise SkipRow
+    # Empty rows are common on sheets so skip them without raising.
+    if not row.hyperlink or not row.operation:
+        return None
+    dispatch_id = extract_dispatch_id_from_hyperlink(row.hyperlink)
 
     operation_cell_value = row.operation.lower()
-    try:
-        operation = DispatchOp[operation_cell_value.upper()]
-    except KeyError as err:
-        raise InvalidDispatchRowError(
-            operation_cell_value, "Invalid operation."
-        ) from err
+    operation = DISPATCH_OPS_BY_NAME.get(operation_cell_value)
+    if operation is None:
+        raise InvalidDispatchRowError(operation_cell_value, "Invalid operation.")
 
     if not row.owner_id:
         raise InvalidDispatchRowError(operation, "Owner nation cell cannot be empty.")
-    try:
-        owner_nation = owner_nations[row.owner_id].nation_name
-    except KeyError as err:
+    # Stores are read through their dicts to skip UserDict's per-call overhead
+    owner_nation_obj = owner_nations.data.get(row.owner_id)
+    if owner_nation_obj is None:
         raise InvalidDispatchRowError(
             operation, f"Invalid owner nation ID {row.owner_id}"
-        ) from err
-    if not owner_nations.check_spreadsheet_permission(row.owner_id, spreadsheet_id):
+        )
+    owner_nation = owner_nation_obj.nation_name
+    if spreadsheet_id not in owner_nation_obj.allowed_spreadsheet_ids:
         raise InvalidDispatchRowError(
             operation,
             f"Owner nation {row.owner_id} cannot be used on this spreadsheet.",
@@ -699,14 +806,13 @@ def parse_dispatch_cell_values_of_row(
 
     if not row.category_setup_id:
         raise InvalidDispatchRowError(operation, "Category setup cell cannot be empty.")
-    try:
-        category_setup = category_setups[row.category_setup_id]
-        category = category_setup.category_name
-        subcategory = category_setup.subcategory_name
-    except KeyError as err:
+    category_setup = category_setups.data.get(row.category_setup_id)
+    if category_setup is None:
         raise InvalidDispatchRowError(
             operation, f"Invalid category setup ID {row.category_setup_id}"
-        ) from err
+        )
+    category = category_setup.category_name
+    subcategory = category_setup.subcategory_name
 
     if not row.title:
         raise InvalidDispatchRowError(operation, "Title column cannot be empty")
@@ -731,8 +837,8 @@ def parse_dispatch_cell_values_of_rows(
     owner_nations: OwnerNationStore,
     category_setups: CategorySetupStore,
     report_failure: ReportFailureCb,
-) -> dict[str, Dispatch]:
-    """Parse dispatch sheet rows' cell values and return Dispatch objects.
+) -> Iterator[tuple[str, Dispatch]]:
+    """Parse dispatch sheet rows' cell values and yield Dispatch objects.
 
     Args:
         rows (DispatchRows): Dispatch data rows
@@ -741,29 +847,32 @@ def parse_dispatch_cell_values_of_rows(
         category_setups (CategorySetupStore): Category setup data
         report_failure (ReportFailureCb): Failure report callback
 
-    Returns:
-        dict[str, Dispatch]: Dispatch objects
+    Yields:
+        tuple[str, Dispatch]: Dispatch name and Dispatch object
     """
 
-    dispatches: dict[str, Dispatch] = {}
-
     for row in rows:
+        # Sheets usually have many blank rows so drop them before any parsing
+        if not row.hyperlink:
+            continue
+
         dispatch_name = extract_name_from_hyperlink(row.hyperlink)
 
         try:
             dispatch = parse_dispatch_cell_values_of_row(
                 row, spreadsheet_id, owner_nations, category_setups
             )
-            dispatches[dispatch_name] = dispatch
-        except SkipRow:
-            logger.debug('Skipped spreadsheet row of dispatch "%s"', dispatch_name)
         except InvalidDispatchRowError as err:
             logger.error(
                 'Spreadsheet row of dispatch "%s" is invalid: %s', dispatch_name, err
             )
             report_failure(dispatch_name, err.operation, err)
+            continue
 
-    return dispatches
+        if dispatch is None:
+            logger.debug('Skipped spreadsheet row of dispatch "%s"', dispatch_name)
+        else:
+            yield dispatch_name, dispatch
 
 
 def parse_dispatch_cell_values_of_ranges(
@@ -785,116 +894,186 @@ def parse_dispatch_cell_values_of_ranges(
         dict[str, Dispatch]: Dispatch objects keyed by dispatch name
     """
 
-    dispatches: dict[str, Dispatch] = {}
-    for sheet_range, rows in sheet_ranges.items():
-        row_dispatches = parse_dispatch_cell_values_of_rows(
-            rows,
-            sheet_range.spreadsheet_id,
-            owner_nations,
-            category_setups,
-            report_failure,
+    return dict(
+        itertools.chain.from_iterable(
+            parse_dispatch_cell_values_of_rows(
+                rows,
+                sheet_range.spreadsheet_id,
+                owner_nations,
+                category_setups,
+                report_failure,
+            )
+            for sheet_range, rows in sheet_ranges.items()
         )
-        dispatches.update(row_dispatches)
-    return dispatches
+    )
 
 
-def generate_new_dispatch_cell_values_of_range(
-    old_rows: DispatchRows,
-    dispatches: Mapping[str, Dispatch],
-    op_results: Mapping[str, OpResult],
-) -> RangeCellValues:
-    """Generate new dispatch cell values for a spreadsheet range
-    with updated values such as dispatch IDs, status messages,...
+@dataclass(frozen=True, slots=True)
+class DispatchRowRef:
+    """Describes where a dispatch sheet row is and the values of its cells
+    that can change after a dispatch operation."""
+
+    sheet_range: SheetRange
+    row_pos: int
+    hyperlink: str
+    operation: str
+    status: str
+
+    # Column positions of the cells above in a dispatch sheet row
+    UPDATABLE_CELL_COLS: ClassVar[dict[str, int]] = {
+        "hyperlink": 0,
+        "operation": 1,
+        "status": 6,
+    }
+
+
+DispatchRowIndex = dict[str, list[DispatchRowRef]]
+
+
+def index_dispatch_rows(
+    dispatch_rows: Mapping[SheetRange, DispatchRows],
+) -> DispatchRowIndex:
+    """Index dispatch sheet rows by dispatch name.
 
     Args:
-        old_rows (DispatchRows): Old cell data of a dispatch sheet range
-        dispatches (Mapping[str, Dispatch]): New dispatch info
-        op_results (Mapping[str, OpResult]): Dispatch operation results
+        dispatch_rows (Mapping[SheetRange, DispatchRows]): Dispatch rows of ranges
 
     Returns:
-        RangeCellData: New dispatch cell data
+        DispatchRowIndex: Dispatch row references keyed by dispatch name
     """
 
-    new_row_values: RangeCellValues = []
+    # Rows with similar names are all kept so that all of them are updated
+    row_index: DispatchRowIndex = defaultdict(list)
+    for sheet_range, rows in dispatch_rows.items():
+        for row_pos, row in enumerate(rows):
+            if not row.hyperlink:
+                continue
+            row_index[extract_name_from_hyperlink(row.hyperlink)].append(
+                DispatchRowRef(
+                    sheet_range, row_pos, row.hyperlink, row.operation, row.status
+                )
+            )
+    return dict(row_index)
 
-    for row in old_rows:
-        dispatch_name = extract_name_from_hyperlink(row.hyperlink)
 
-        try:
-            op_result = op_results[dispatch_name]
-        except KeyError:
-            new_row_values.append(row.to_cell_values())
-            continue
+def generate_new_dispatch_row(
+    old_row: DispatchRowRef,
+    dispatch_name: str,
+    dispatch: Dispatch | None,
+    new_dispatch_id: str | None,
+    op_result: OpResult,
+) -> DispatchRowRef:
+    """Generate a new dispatch sheet row with updated values
+    such as dispatch ID, status message,...
 
-        new_status = op_result.result_message
-        if isinstance(op_result, FailureOpResult):
-            new_dispatch_row = dataclasses.replace(row, status=new_status)
-            new_row_values.append(new_dispatch_row.to_cell_values())
-            continue
+    Args:
+        old_row (DispatchRowRef): Old dispatch sheet row
+        dispatch_name (str): Dispatch name
+        dispatch (Dispatch | None): New dispatch info. None if the row was invalid
+        new_dispatch_id (str | None): ID of the dispatch if it was just created
+        op_result (OpResult): Dispatch operation result
 
-        dispatch = dispatches[dispatch_name]
-
-        new_dispatch_name = row.hyperlink
-        new_operation = row.operation
-        if dispatch.operation == DispatchOp.CREATE and dispatch.ns_id is not None:
-            new_dispatch_name = create_hyperlink(dispatch_name, dispatch.ns_id)
-            new_operation = "edit"
-        elif dispatch.operation == DispatchOp.DELETE:
-            new_operation = ""
-
-        new_dispatch_row = DispatchRow(
-            new_dispatch_name,
-            new_operation,
-            row.owner_id,
-            row.category_setup_id,
-            row.title,
-            row.template,
-            new_status,
-        )
-        new_row_values.append(new_dispatch_row.to_cell_values())
+    Returns:
+        DispatchRowRef: New dispatch sheet row
+    """
 
-    return new_row_values
+    new_status = op_result.result_message
+    if op_result.is_failure or dispatch is None:
+        return dataclasses.replace(old_row, status=new_status)
+
+    new_dispatch_name = old_row.hyperlink
+    new_operation = old_row.operation
+    if dispatch.operation == DispatchOp.CREATE and new_dispatch_id is not None:
+        new_dispatch_name = create_hyperlink(dispatch_name, new_dispatch_id)
+        new_operation = DispatchOp.EDIT.name.lower()
+    elif dispatch.operation == DispatchOp.DELETE:
+        new_operation = ""
+
+    return dataclasses.replace(
+        old_row,
+        hyperlink=new_dispatch_name,
+        operation=new_operation,
+        status=new_status,
+    )
 
 
 def generate_new_dispatch_cell_values_for_ranges(
-    old_spreadsheet_cell_values: Mapping[SheetRange, DispatchRows],
-    dispatch_config: Mapping[str, Dispatch],
+    dispatch_row_index: DispatchRowIndex,
+    dispatches: Mapping[str, Dispatch],
+    new_dispatch_ids: Mapping[str, str],
     op_results: Mapping[str, OpResult],
 ) -> MultiRangeCellValues:
-    """Generate new dispatch cell values for many spreadsheet ranges
-    with updated values such as dispatch IDs, status messages,...
+    """Generate new dispatch cell values with updated values
+    such as dispatch IDs, status messages,... Only cells whose values
+    changed are included, each as its own single-cell range.
 
     Args:
-        old_spreadsheet_values (Mapping[SheetRange, DispatchRows]): Old cell values
-        dispatch_config (Mapping[str, Dispatch]): New dispatch config
-        operation_results (Mapping[str, OpResult]): Dispatch operation results
+        dispatch_row_index (DispatchRowIndex): Dispatch row index
+        dispatches (Mapping[str, Dispatch]): New dispatch info
+        new_dispatch_ids (Mapping[str, str]): IDs of newly created dispatches
+        op_results (Mapping[str, OpResult]): Dispatch operation results
 
     Returns:
-        MultiRangeCellValues: New spreadsheet cell values
+        MultiRangeCellValues: New cell values keyed by cell range
     """
 
-    new_spreadsheet_cell_values: Mapping[SheetRange, RangeCellValues] = {}
-    for sheet_range, cell_values in old_spreadsheet_cell_values.items():
-        new_range_cell_values = generate_new_dispatch_cell_values_of_range(
-            cell_values, dispatch_config, op_results
-        )
-        new_spreadsheet_cell_values[sheet_range] = new_range_cell_values
-    return new_spreadsheet_cell_values
+    new_cell_values: MultiRangeCellValues = {}
+
+    for dispatch_name, op_result in op_results.items():
+        for row_ref in dispatch_row_index.get(dispatch_name, []):
+            new_row = generate_new_dispatch_row(
+                row_ref,
+                dispatch_name,
+                dispatches.get(dispatch_name),
+                new_dispatch_ids.get(dispatch_name),
+                op_result,
+            )
+            for name, col_pos in DispatchRowRef.UPDATABLE_CELL_COLS.items():
+                new_value = getattr(new_row, name)
+                if new_value == getattr(row_ref, name):
+                    continue
+                cell_range = row_ref.sheet_range.get_row_range(
+                    row_ref.row_pos, col_pos, col_pos
+                )
+                new_cell_values[cell_range] = [[new_value]]
+
+    return new_cell_values
 
 
 class DispatchStore(UserDict[str, Dispatch]):
     """Contains template and metadata of dispatches."""
 
+    def __init__(self, dispatches: Mapping[str, Dispatch] | None = None) -> None:
+        self._metadata_cache: DispatchesMetadata | None = None
+        super().__init__(dispatches)
+        # IDs of new dispatches are kept aside to avoid rebuilding Dispatch objects
+        self.new_dispatch_ids: dict[str, str] = {}
+
+    def __setitem__(self, name: str, dispatch: Dispatch) -> None:
+        self._metadata_cache = None
+        super().__setitem__(name, dispatch)
+
+    def __delitem__(self, name: str) -> None:
+        self._metadata_cache = None
+        super().__delitem__(name)
+
     def get_dispatches_metadata(self) -> DispatchesMetadata:
-        """Get metadata of all dispatches.
+        """Get metadata of all dispatches. The result is cached
+        until the dispatches or their IDs change.
 
         Returns:
             DispatchesMetadata: Metadata of dispatches
         """
 
+        if self._metadata_cache is None:
+            self._metadata_cache = self._build_dispatches_metadata()
+        # Callers get a copy so that changing it cannot corrupt the cache
+        return dict(self._metadata_cache)
+
+    def _build_dispatches_metadata(self) -> DispatchesMetadata:
         return {
             name: DispatchMetadata(
-                dispatch.ns_id,
+                self.new_dispatch_ids.get(name, dispatch.ns_id),
                 dispatch.operation,
                 dispatch.owner_nation,
                 dispatch.title,
@@ -924,8 +1103,10 @@ class DispatchStore(UserDict[str, Dispatch]):
             dispatch_id (str): Dispatch id
         """
 
-        dispatch = self.data[name]
-        self.data[name] = dataclasses.replace(dispatch, ns_id=dispatch_id)
+        if name not in self.data:
+            raise KeyError(f'Could not find dispatch "{name}"')
+        self.new_dispatch_ids[name] = dispatch_id
+        self._metadata_cache = None
 
 
 class GoogleDispatchLoader:
@@ -933,7 +1114,7 @@ class GoogleDispatchLoader:
 
     Args:
         spreadsheet_api (GoogleSheetsApiAdapter): Spreadsheet API adapter
-        dispatch_rows (Mapping[SheetRange, DispatchRows]): Dispatch spreadsheet values
+        dispatch_row_index (DispatchRowIndex): Dispatch rows keyed by dispatch name
         utility_templates (Mapping[str, str]): Utility template spreadsheet values
         owner_nations (OwnerNationStore): Owner nation spreadsheet values
         category_setups (CategorySetupStore): Category setup spreadsheet values
@@ -942,7 +1123,7 @@ class GoogleDispatchLoader:
     def __init__(
         self,
         api: GoogleSheetsApiAdapter,
-        dispatch_rows: Mapping[SheetRange, DispatchRows],
+        dispatch_row_index: DispatchRowIndex,
         dispatches: DispatchStore,
         utility_templates: Mapping[str, str],
         owner_nations: OwnerNationStore,
@@ -952,12 +1133,17 @@ class GoogleDispatchLoader:
         self.spreadsheet_api = api
         self.op_result_store = op_result_store
 
-        self.dispatch_rows = dispatch_rows
+        self.dispatch_row_index = dispatch_row_index
 
         self.owner_nations = owner_nations
         self.category_setups = category_setups
         self.utility_templates = utility_templates
         self.dispatches = dispatches
+        # Utility templates take precedence over dispatches with similar names
+        self.templates = {
+            **{name: dispatch.template for name, dispatch in dispatches.items()},
+            **utility_templates,
+        }
 
     def get_dispatches_metadata(self) -> DispatchesMetadata:
         """Get metadata of all dispatches.
@@ -978,9 +1164,7 @@ class GoogleDispatchLoader:
             str: Template text
         """
 
-        if name in self.utility_templates:
-            return self.utility_templates[name]
-        return self.dispatches.get_dispatch_template(name)
+        return self.templates[name]
 
     def add_dispatch_id(self, name: str, dispatch_id: str) -> None:
         """Add id of new dispatch.
@@ -1019,29 +1203,34 @@ class GoogleDispatchLoader:
         """Update spreadsheets."""
 
         new_dispatch_values = generate_new_dispatch_cell_values_for_ranges(
-            self.dispatch_rows,
+            self.dispatch_row_index,
             self.dispatches,
+            self.dispatches.new_dispatch_ids,
             self.op_result_store,
         )
+        if not new_dispatch_values:
+            logger.info("No Google spreadsheet cells to update.")
+            return
+
         self.spreadsheet_api.update_values_of_ranges(new_dispatch_values)
         logger.info("Updated Google spreadsheets.")
 
 
-def flatten_spreadsheet_config(config: Any) -> Sequence[SheetRange]:
+def flatten_spreadsheet_config(config: Any) -> Iterator[SheetRange]:
     """Flatten spreadsheet configuration dict.
 
     Args:
         config (Any): Configuration dict
 
     Returns:
-        Sequence[SheetRange]: Flatten dict
+        Iterator[SheetRange]: Flatten dict
     """
 
-    return [
+    return (
         SheetRange(spreadsheet["spreadsheet_id"], range)
         for spreadsheet in config
         for range in spreadsheet["ranges"]
-    ]
+    )
 
 
 @loader_api.dispatch_loader
@@ -1051,45 +1240,60 @@ def init_dispatch_loader(loaders_config: Config):
     google_api_creds = service_account.Credentials.from_service_account_file(
         loader_config["google_cred_path"], scopes=GOOGLE_API_SCOPES
     )
+    # One authorized HTTP object is shared by the client to keep its connection alive.
+    # build_http() applies the client library's default socket timeout.
+    google_api_http = google_auth_httplib2.AuthorizedHttp(
+        google_api_creds, http=build_http()
+    )
     # pylint: disable=maybe-no-member
     google_api = (
-        discovery.build(
-            "sheets", "v4", credentials=google_api_creds, cache_discovery=False
-        )
+        discovery.build("sheets", "v4", http=google_api_http, cache_discovery=False)
         .spreadsheets()
         .values()
     )
-    sheets_api = GoogleSheetsApiAdapter(google_api)
+    sheets_api = GoogleSheetsApiAdapter(
+        google_api,
+        lambda: google_auth_httplib2.AuthorizedHttp(
+            google_api_creds, http=build_http()
+        ),
+    )
     op_result_store = OpResultStore()
 
-    owner_nation_rows = sheets_api.get_values_of_range(
-        SheetRange(
-            loader_config["owner_nation_sheet"]["spreadsheet_id"],
-            loader_config["owner_nation_sheet"]["range"],
-        )
+    owner_nation_range = SheetRange(
+        loader_config["owner_nation_sheet"]["spreadsheet_id"],
+        loader_config["owner_nation_sheet"]["range"],
     )
-    owner_nations = OwnerNationStore.load_from_range_cell_values(owner_nation_rows)
-
-    category_setup_rows = sheets_api.get_values_of_range(
-        SheetRange(
-            loader_config["category_setup_sheet"]["spreadsheet_id"],
-            loader_config["category_setup_sheet"]["range"],
-        )
+    category_setup_range = SheetRange(
+        loader_config["category_setup_sheet"]["spreadsheet_id"],
+        loader_config["category_setup_sheet"]["range"],
     )
-    category_setups = CategorySetupStore.load_from_range_cell_values(
-        category_setup_rows
+    utility_template_ranges = list(
+        flatten_spreadsheet_config(loader_config["utility_template_spreadsheets"])
+    )
+    dispatch_ranges = list(
+        flatten_spreadsheet_config(loader_config["dispatch_spreadsheets"])
     )
 
-    utility_template_rows = UtilityTemplateRow.get_many_from_api(
-        sheets_api,
-        flatten_spreadsheet_config(loader_config["utility_template_spreadsheets"]),
+    # Get all ranges at once so ranges of the same spreadsheet share a request
+    values = sheets_api.get_values_of_ranges_in_order(
+        [
+            owner_nation_range,
+            category_setup_range,
+            *utility_template_ranges,
+            *dispatch_ranges,
+        ]
     )
-    utility_templates = parse_utility_template_sheet_rows(utility_template_rows)
+    utility_template_end = 2 + len(utility_template_ranges)
 
-    dispatch_rows = DispatchRow.get_many_from_api(
-        sheets_api,
-        flatten_spreadsheet_config(loader_config["dispatch_spreadsheets"]),
+    owner_nations = OwnerNationStore.load_from_range_cell_values(values[0][1])
+    category_setups = CategorySetupStore.load_from_range_cell_values(values[1][1])
+
+    utility_template_rows = UtilityTemplateRow.from_api_values(
+        dict(values[2:utility_template_end])
     )
+    utility_templates = parse_utility_template_sheet_rows(utility_template_rows)
+
+    dispatch_rows = DispatchRow.from_api_values(dict(values[utility_template_end:]))
     dispatches = DispatchStore(
         parse_dispatch_cell_values_of_ranges(
             dispatch_rows,
@@ -1103,7 +1307,7 @@ def init_dispatch_loader(loaders_config: Config):
 
     return GoogleDispatchLoader(
         sheets_api,
-        dispatch_rows,
+        index_dispatch_rows(dispatch_rows),
         dispatches,
         utility_templates,
         owner_nations,
@@ -1141,4 +1345,7 @@ def add_dispatch_id(loader: GoogleDispatchLoader, name: str, dispatch_id: str) -
 
 @loader_api.dispatch_loader
 def cleanup_dispatch_loader(loader: GoogleDispatchLoader) -> None:
-    loader.update_spreadsheets()
+    try:
+        loader.update_spreadsheets()
+    finally:
+        loader.spreadsheet_api.close()
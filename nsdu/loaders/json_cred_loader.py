@@ -3,6 +3,8 @@
 
 import json
 import logging
+import os
+import stat
 from pathlib import Path
 
 from nsdu import info, loader_api
@@ -32,8 +34,7 @@ class JSONCredLoader:
         """Load credentials from JSON file."""
 
         try:
-            with open(self.cred_file_path) as f:
-                self.creds = json.load(f)
+            self.creds = json.loads(self.cred_file_path.read_bytes())
         except FileNotFoundError:
             pass
 
@@ -63,6 +64,9 @@ class JSONCredLoader:
             autologin_code (str): Autologin code
         """
 
+        if self.creds.get(name) == autologin_code:
+            return
+
         self.creds[name] = autologin_code
         self.changed = True
 
@@ -79,11 +83,35 @@ class JSONCredLoader:
         self.changed = True
 
     def save(self) -> None:
-        """Save creds to JSON file."""
+        """Save creds to JSON file. The file is replaced atomically
+        so a failed write cannot corrupt existing creds."""
+
+        if not self.changed:
+            return
 
-        if self.changed:
-            with open(self.cred_file_path, "w") as f:
-                json.dump(self.creds, f)
+        tmp_file_path = self.cred_file_path.with_name(
+            f"{self.cred_file_path.name}.tmp"
+        )
+        # Serialize first so the file is written with a single call
+        data = json.dumps(self.creds).encode()
+
+        # Creds are secret so keep the existing file's mode or restrict to the owner
+        try:
+            file_mode = stat.S_IMODE(os.stat(self.cred_file_path).st_mode)
+        except FileNotFoundError:
+            file_mode = 0o600
+
+        fd = os.open(tmp_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with open(fd, "wb") as f:
+                os.fchmod(f.fileno(), file_mode)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file_path, self.cred_file_path)
+        except BaseException:
+            tmp_file_path.unlink(missing_ok=True)
+            raise
 
 
 @loader_api.cred_loader
@@ -20,7 +20,8 @@ def get_template_vars(loaders_config: Config) -> TemplateVars:
     template_vars: TemplateVars = {}
     for path in var_file_paths:
         try:
-            file_content = expanded_path(path).read_text()
+            # JSON is decoded from bytes directly to skip text I/O decoding
+            file_content = expanded_path(path).read_bytes()
             template_vars.update(json.loads(file_content))
         except FileNotFoundError as err:
             raise loader_api.LoaderError(
@@ -1,7 +1,10 @@
 """Wrappers for NationStates API calls.
 """
 
+import functools
 import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Mapping
 
 import nationstates
 from nationstates import exceptions as ns_exceptions
@@ -9,6 +12,27 @@ from nationstates.objects import Nation
 
 from nsdu import exceptions
 
+DISPATCH_ID_REGEX = re.compile(r"id=(\d+)")
+# The client's rate limiter is thread-safe so a few requests can be in flight
+MAX_CONCURRENT_REQUESTS = 4
+
+
+# A run normally uses a single user agent
+@functools.lru_cache(maxsize=4)
+def get_original_api(user_agent: str) -> nationstates.Nationstates:
+    """Get the NationStates API client of a user agent. The client is shared
+    so all wrappers go through its rate limiter. Connections are not reused
+    since the client does not keep a session in its default threading mode.
+
+    Args:
+        user_agent (str): User agent for API calls
+
+    Returns:
+        nationstates.Nationstates: NationStates API client
+    """
+
+    return nationstates.Nationstates(user_agent=user_agent, enable_beta=True)
+
 
 class NsApiError(exceptions.AppError):
     """NationStates API error."""
@@ -36,9 +60,7 @@ class AuthApi:
             user_agent (str): User agent for API calls
         """
 
-        self.original_api = nationstates.Nationstates(
-            user_agent=user_agent, enable_beta=True
-        )
+        self.original_api = get_original_api(user_agent)
 
     def get_autologin_code(self, nation_name: str, password: str) -> str:
         """Get autologin code of a nation from its password.
@@ -83,6 +105,25 @@ class AuthApi:
         except ns_exceptions.Forbidden:
             return False
 
+    def verify_autologin_codes(self, creds: Mapping[str, str]) -> dict[str, bool]:
+        """Verify if autologin codes can log in to their nations.
+        Nations are checked concurrently within the client's rate limit.
+
+        Args:
+            creds (Mapping[str, str]): Autologin codes keyed by nation name
+
+        Returns:
+            dict[str, bool]: Verification results keyed by nation name
+        """
+
+        if not creds:
+            return {}
+
+        max_workers = min(MAX_CONCURRENT_REQUESTS, len(creds))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self.verify_autologin_code, creds, creds.values())
+            return dict(zip(creds, results))
+
 
 def convert_to_html_entities(text: str) -> bytes:
     """Convert special characters to HTML entities
@@ -110,7 +151,7 @@ def parse_resp_for_new_dispatch_id(resp_text: str) -> str:
         str: Dispatch ID
     """
 
-    matches = re.search("id=(\\d+)", resp_text)
+    matches = DISPATCH_ID_REGEX.search(resp_text)
 
     if matches is None:
         raise DispatchApiError("No dispatch ID found in API response")
@@ -131,9 +172,7 @@ class DispatchApi:
         Args:
             user_agent (str): User agent for API calls
         """
-        self.original_api = nationstates.Nationstates(
-            user_agent=user_agent, enable_beta=True
-        )
+        self.original_api = get_original_api(user_agent)
         self.nation: Nation | None = None
 
     def set_nation(self, nation_name: str, autologin: str) -> None:
@@ -2,6 +2,7 @@
 """
 
 import logging
+from collections import ChainMap
 from pathlib import Path
 from typing import Callable, Mapping, Sequence
 
@@ -165,8 +166,8 @@ class DispatchRenderer:
             str: Rendered dispatch
         """
 
-        context = self.global_context
-        context["current_dispatch_name"] = name
+        # Overlay the dispatch name to keep the global context unchanged
+        context = ChainMap({"current_dispatch_name": name}, self.global_context)
 
         rendered = self.template_renderer.render(name, context)
         rendered = self.bbc_parser.format(rendered, context)
@@ -45,6 +45,27 @@ class TestNsduCred:
         with pytest.raises(exceptions.UserError):
             feature.add_autologin_cred("nat", "")
 
+    def test_add_correct_autologin_creds_calls_cred_loader_with_autologin_codes(
+        self, feature
+    ):
+        feature.auth_api.verify_autologin_codes.return_value = {
+            "nat1": True,
+            "nat2": True,
+        }
+
+        feature.add_autologin_creds({"nat1": "1", "nat2": "2"})
+
+        feature.auth_api.get_autologin_code.assert_not_called()
+        feature.cred_loader_manager.add_cred.assert_has_calls(
+            [mock.call("nat1", "1"), mock.call("nat2", "2")]
+        )
+
+    def test_add_wrong_autologin_codes_raises_exception(self, feature):
+        feature.auth_api.verify_autologin_codes.return_value = {"nat": False}
+
+        with pytest.raises(exceptions.UserError):
+            feature.add_autologin_creds({"nat": ""})
+
     def test_remove_nation_cred_calls_cred_loader(self, feature):
         feature.remove_cred("nat")
         feature.cleanup()
@@ -84,6 +84,12 @@ def test_parse_valid_dispatch_metadata_dict(metadata_dict, expected):
             "category": "c",
             "subcategory": "sc",
         },
+        {
+            "op": "publish",
+            "title": "t",
+            "category": "c",
+            "subcategory": "sc",
+        },
     ],
 )
 def test_parse_invalid_dispatch_metadata_dict(metadata_dict):
@@ -12,19 +12,54 @@ from nsdu.loaders.google_dispatch_loader import (
     CategorySetup,
     Dispatch,
     DispatchRow,
+    DispatchRowRef,
     FailureOpResult,
     InvalidDispatchRowError,
     OwnerNation,
     SheetRange,
-    SkipRow,
     SuccessOpResult,
     UtilityTemplateRow,
 )
 
 
+class TestSheetRange:
+    @pytest.mark.parametrize(
+        "range_value,row_pos,first_col_pos,last_col_pos,expected",
+        [
+            ["A!A1:F", 0, 0, 6, "A!A1:G1"],
+            ["A!B3:F", 2, 0, 0, "A!B5"],
+            ["'Sheet 1'!A3:G100", 1, 6, 6, "'Sheet 1'!G4"],
+            ["A!Y1:Z", 0, 1, 2, "A!Z1:AA1"],
+            ["A:G", 4, 0, 1, "A5:B5"],
+        ],
+    )
+    def test_get_row_range_returns_a1_range_of_cells(
+        self, range_value, row_pos, first_col_pos, last_col_pos, expected
+    ):
+        sheet_range = SheetRange("s", range_value)
+
+        result = sheet_range.get_row_range(row_pos, first_col_pos, last_col_pos)
+
+        assert result == SheetRange("s", expected)
+
+    def test_get_row_range_of_invalid_range_raises_exception(self):
+        sheet_range = SheetRange("s", "A!1:2")
+
+        with pytest.raises(ValueError):
+            sheet_range.get_row_range(0, 0, 0)
+
+
+@pytest.mark.parametrize(
+    "letter,index", [["A", 0], ["z", 25], ["AA", 26], ["AZ", 51], ["BA", 52]]
+)
+def test_convert_between_column_letter_and_index(letter, index):
+    assert loader.column_letter_to_index(letter) == index
+    assert loader.column_index_to_letter(index) == letter.upper()
+
+
 class TestGoogleSheetsApiAdapter:
     @pytest.mark.parametrize("range_cell_values", [[[["v"]]], [[]]])
-    def test_get_values_of_a_range_returns_cell_values_of_range(
+    def test_get_values_of_ranges_in_order_with_one_range_returns_cell_values(
         self, range_cell_values
     ):
         api_resp = {
@@ -42,9 +77,9 @@ class TestGoogleSheetsApiAdapter:
         api = loader.GoogleSheetsApiAdapter(google_api)
 
         sheet_range = SheetRange("s", "A!A1:F")
-        result = api.get_values_of_range(sheet_range)
+        result = api.get_values_of_ranges_in_order([sheet_range])
 
-        assert result == range_cell_values
+        assert result == [(sheet_range, range_cell_values)]
 
     @pytest.mark.parametrize(
         "range_resp,expected",
@@ -54,17 +89,17 @@ class TestGoogleSheetsApiAdapter:
                     {"range": "A!A1:F", "majorDimension": "ROWS", "values": [["v1"]]},
                     {"range": "B!A1:F", "majorDimension": "ROWS", "values": [["v2"]]},
                 ],
-                {
-                    SheetRange("s", "A!A1:F"): [["v1"]],
-                    SheetRange("s", "B!A1:F"): [["v2"]],
-                },
+                [
+                    (SheetRange("s", "A!A1:F"), [["v1"]]),
+                    (SheetRange("s", "B!A1:F"), [["v2"]]),
+                ],
             ],
             [
                 [
                     {"range": "A!A1:F", "majorDimension": "ROWS"},
                     {"range": "B!A1:F", "majorDimension": "ROWS"},
                 ],
-                {SheetRange("s", "A!A1:F"): [], SheetRange("s", "B!A1:F"): []},
+                [(SheetRange("s", "A!A1:F"), []), (SheetRange("s", "B!A1:F"), [])],
             ],
         ],
     )
@@ -77,10 +112,141 @@ class TestGoogleSheetsApiAdapter:
         api = loader.GoogleSheetsApiAdapter(google_api)
 
         ranges = [SheetRange("s", "A!A1:F"), SheetRange("s", "B!A1:F")]
-        result = api.get_values_of_ranges(ranges)
+        result = api.get_values_of_ranges_in_order(ranges)
 
         assert result == expected
 
+    def test_get_values_of_interleaved_ranges_makes_one_call_per_spreadsheet(self):
+        def batch_get(spreadsheetId, ranges, valueRenderOption):
+            value_ranges = [{"range": range, "values": [["v"]]} for range in ranges]
+            resp = {"spreadsheetId": spreadsheetId, "valueRanges": value_ranges}
+            return Mock(execute=Mock(return_value=resp))
+
+        google_api = Mock(batchGet=Mock(side_effect=batch_get))
+        api = loader.GoogleSheetsApiAdapter(google_api)
+
+        ranges = [SheetRange("s1", "A"), SheetRange("s2", "B"), SheetRange("s1", "C")]
+        result = api.get_values_of_ranges_in_order(ranges)
+
+        assert google_api.batchGet.call_count == 2
+        google_api.batchGet.assert_any_call(
+            spreadsheetId="s1", ranges=["A", "C"], valueRenderOption="FORMULA"
+        )
+        assert result == [
+            (SheetRange("s1", "A"), [["v"]]),
+            (SheetRange("s2", "B"), [["v"]]),
+            (SheetRange("s1", "C"), [["v"]]),
+        ]
+
+    def test_get_values_of_ranges_in_order_returns_values_in_requested_order(self):
+        def batch_get(spreadsheetId, ranges, valueRenderOption):
+            value_ranges = [
+                {"range": f"{range}1:B2", "values": [[range]]} for range in ranges
+            ]
+            resp = {"spreadsheetId": spreadsheetId, "valueRanges": value_ranges}
+            return Mock(execute=Mock(return_value=resp))
+
+        google_api = Mock(batchGet=Mock(side_effect=batch_get))
+        api = loader.GoogleSheetsApiAdapter(google_api)
+
+        ranges = [SheetRange("s1", "A"), SheetRange("s2", "B"), SheetRange("s1", "C")]
+        result = api.get_values_of_ranges_in_order(ranges)
+
+        assert result == [
+            (SheetRange("s1", "A1:B2"), [["A"]]),
+            (SheetRange("s2", "B1:B2"), [["B"]]),
+            (SheetRange("s1", "C1:B2"), [["C"]]),
+        ]
+
+    def test_update_values_of_interleaved_ranges_makes_one_call_per_spreadsheet(
+        self,
+    ):
+        google_api = Mock()
+        api = loader.GoogleSheetsApiAdapter(google_api)
+
+        new_values = {
+            SheetRange("s1", "A"): [["v1"]],
+            SheetRange("s2", "B"): [["v2"]],
+            SheetRange("s1", "C"): [["v3"]],
+        }
+        api.update_values_of_ranges(new_values)
+
+        assert google_api.batchUpdate.call_count == 2
+        google_api.batchUpdate.assert_any_call(
+            spreadsheetId="s1",
+            body={
+                "valueInputOption": "USER_ENTERED",
+                "data": [
+                    {"range": "A", "values": [["v1"]]},
+                    {"range": "C", "values": [["v3"]]},
+                ],
+            },
+        )
+
+    def test_get_values_of_many_spreadsheets_with_http_factory_returns_cell_values(
+        self,
+    ):
+        def batch_get(spreadsheetId, ranges, valueRenderOption):
+            value_ranges = [{"range": range, "values": [["v"]]} for range in ranges]
+            resp = {"spreadsheetId": spreadsheetId, "valueRanges": value_ranges}
+            return Mock(execute=Mock(return_value=resp))
+
+        google_api = Mock(batchGet=Mock(side_effect=batch_get))
+        api = loader.GoogleSheetsApiAdapter(google_api, Mock())
+
+        ranges = [SheetRange("s1", "A"), SheetRange("s2", "B")]
+        result = api.get_values_of_ranges_in_order(ranges)
+
+        assert result == [
+            (SheetRange("s1", "A"), [["v"]]),
+            (SheetRange("s2", "B"), [["v"]]),
+        ]
+
+    def test_execute_many_with_http_factory_reuses_http_of_thread(self):
+        requests = [Mock(), Mock(), Mock()]
+        http = Mock()
+        http_factory = Mock(return_value=http)
+        api = loader.GoogleSheetsApiAdapter(Mock(), http_factory, max_workers=1)
+
+        api.execute_many(requests)
+        api.execute_many(requests)
+
+        http_factory.assert_called_once()
+        requests[0].execute.assert_called_with(
+            http=http, num_retries=loader.MAX_REQUEST_RETRIES
+        )
+
+    def test_close_after_execute_many_shuts_down_worker_threads(self):
+        requests = [Mock(), Mock()]
+        api = loader.GoogleSheetsApiAdapter(Mock(), Mock())
+        api.execute_many(requests)
+
+        with mock.patch.object(
+            loader.ThreadPoolExecutor, "shutdown", autospec=True
+        ) as shutdown:
+            api.close()
+
+        shutdown.assert_called_once()
+
+    def test_close_without_worker_threads_does_nothing(self):
+        api = loader.GoogleSheetsApiAdapter(Mock(), Mock())
+
+        api.close()
+
+    def test_execute_many_with_http_factory_raises_api_error(self):
+        request = Mock(execute=Mock(side_effect=loader.HttpError(Mock(), b"")))
+        api = loader.GoogleSheetsApiAdapter(Mock(), Mock())
+
+        with pytest.raises(loader.GoogleApiError):
+            api.execute_many([request, request])
+
+    def test_execute_request_retries_transient_errors(self):
+        request = Mock()
+
+        loader.GoogleSheetsApiAdapter.execute(request)
+
+        request.execute.assert_called_with(num_retries=loader.MAX_REQUEST_RETRIES)
+
     def test_update_values_of_many_ranges_makes_correct_api_client_call(self):
         google_api = Mock()
         api = loader.GoogleSheetsApiAdapter(google_api)
@@ -90,7 +256,7 @@ class TestGoogleSheetsApiAdapter:
 
         expected_body = {
             "valueInputOption": "USER_ENTERED",
-            "data": [{"range": "A!A1:F", "majorDimension": "ROWS", "values": [["v"]]}],
+            "data": [{"range": "A!A1:F", "values": [["v"]]}],
         }
         google_api.batchUpdate.assert_called_with(spreadsheetId="s", body=expected_body)
 
@@ -196,6 +362,7 @@ class TestCategorySetupStore:
                 [[1, "", ""], [2, "meta", "reference"]],
                 {"2": CategorySetup("meta", "reference")},
             ],
+            [[[1, "meta"], [2]], {}],
             [[], {}],
         ],
     )
@@ -207,12 +374,12 @@ class TestCategorySetupStore:
 
 class TestOwnerNationData:
     def test_get_owner_nation_returns_nation(self):
-        owner_nations = {"1": loader.OwnerNation("n", [])}
+        owner_nations = {"1": loader.OwnerNation("n", frozenset())}
         obj = loader.OwnerNationStore(owner_nations)
 
         result = obj["1"]
 
-        assert result == OwnerNation("n", [])
+        assert result == OwnerNation("n", frozenset())
 
     def test_get_non_existent_owner_nation_raises_exception(self):
         obj = loader.OwnerNationStore({})
@@ -224,7 +391,7 @@ class TestOwnerNationData:
     def test_check_spreadsheet_permission_returns_permission(
         self, spreadsheet, expected
     ):
-        owner_nations = {"1": loader.OwnerNation("n", ["s"])}
+        owner_nations = {"1": loader.OwnerNation("n", frozenset(["s"]))}
         obj = loader.OwnerNationStore(owner_nations)
 
         result = obj.check_spreadsheet_permission("1", spreadsheet)
@@ -242,14 +409,29 @@ class TestOwnerNationData:
         [
             [
                 [["1", "n1", "s1,s2"], ["2", "n2", "s1"]],
-                {"1": OwnerNation("n1", ["s1", "s2"]), "2": OwnerNation("n2", ["s1"])},
+                {
+                    "1": OwnerNation("n1", frozenset(["s1", "s2"])),
+                    "2": OwnerNation("n2", frozenset(["s1"])),
+                },
             ],
             [
                 [["1", "n1", "s1"], ["1", "n2", "s2"]],
-                {"1": OwnerNation("n2", ["s2"])},
+                {"1": OwnerNation("n2", frozenset(["s2"]))},
+            ],
+            [[["1", "n", ""]], {"1": OwnerNation("n", frozenset())}],
+            [[["1", "n"], ["2"]], {"1": OwnerNation("n", frozenset())}],
+            [
+                [["1", "n", "s1, s2"]],
+                {"1": OwnerNation("n", frozenset(["s1", "s2"]))},
+            ],
+            [
+                [["1", "n", "s1,, s2,"]],
+                {"1": OwnerNation("n", frozenset(["s1", "s2"]))},
+            ],
+            [
+                [["1", "", ""], ["2", "n2", "s1"]],
+                {"2": OwnerNation("n2", frozenset(["s1"]))},
             ],
-            [[["1", "n", ""]], {"1": OwnerNation("n", [])}],
-            [[["1", "", ""], ["2", "n2", "s1"]], {"2": OwnerNation("n2", ["s1"])}],
             [[], {}],
         ],
     )
@@ -266,6 +448,10 @@ class TestOwnerNationData:
             '=hyperlink("https://www.nationstates.net/page=dispatch/id=1234","abc")',
             "abc",
         ],
+        [
+            '=HYPERLINK("https://www.nationstates.net/page=dispatch/id=1", "a""b")',
+            'a""b',
+        ],
         ["xyz", "xyz"],
         ["", ""],
     ],
@@ -276,6 +462,23 @@ def test_extract_name_from_hyperlink_returns_name(hyperlink, expected):
     assert result == expected
 
 
+@pytest.mark.parametrize(
+    "hyperlink,expected",
+    [
+        [
+            '=hyperlink("https://www.nationstates.net/page=dispatch/id=1","abc")',
+            ("1", "abc"),
+        ],
+        ["xyz", (None, "xyz")],
+        ["", (None, "")],
+    ],
+)
+def test_parse_hyperlink_returns_dispatch_id_and_name(hyperlink, expected):
+    result = loader.parse_hyperlink(hyperlink)
+
+    assert result == expected
+
+
 @pytest.mark.parametrize(
     "hyperlink,expected",
     [
@@ -293,6 +496,20 @@ def test_extract_dispatch_id_from_hyperlink_returns_dispatch_id(hyperlink, expec
     assert result == expected
 
 
+@pytest.mark.parametrize(
+    "row,expected",
+    [
+        [["a", 1, "c"], ["a", "1"]],
+        [["a"], ["a", ""]],
+        [[], ["", ""]],
+    ],
+)
+def test_get_row_cell_strs_returns_padded_str_cell_values(row, expected):
+    result = loader.get_row_cell_strs(row, 2)
+
+    assert result == expected
+
+
 class TestUtilityTemplateRow:
     @pytest.mark.parametrize(
         "row,expected",
@@ -324,10 +541,8 @@ class TestUtilityTemplateRow:
             [{}, []],
         ],
     )
-    def test_get_rows_from_api_returns_objs(self, row, expected):
-        sheets_api = Mock(get_values_of_ranges=Mock(return_value=row))
-
-        result = UtilityTemplateRow.get_many_from_api(sheets_api, [])
+    def test_create_from_api_values_returns_objs(self, row, expected):
+        result = UtilityTemplateRow.from_api_values(row)
 
         assert result == expected
 
@@ -409,17 +624,15 @@ class TestDispatchRow:
             [{}, {}],
         ],
     )
-    def test_get_rows_from_api_returns_many_objs(self, row, expected):
-        sheets_api = Mock(get_values_of_ranges=Mock(return_value=row))
-
-        result = DispatchRow.get_many_from_api(sheets_api, [])
+    def test_create_from_api_values_returns_many_objs(self, row, expected):
+        result = DispatchRow.from_api_values(row)
 
         assert result == expected
 
 
 @pytest.fixture(scope="module")
 def owner_nations():
-    return loader.OwnerNationStore({"1": loader.OwnerNation("nat", ["s"])})
+    return loader.OwnerNationStore({"1": loader.OwnerNation("nat", frozenset(["s"]))})
 
 
 @pytest.fixture(scope="module")
@@ -472,11 +685,23 @@ class TestParseDispatchCellValuesOfRow:
 
         assert result == expected
 
+    @pytest.mark.parametrize(
+        "row",
+        [
+            DispatchRow("", "create", "1", "1", "t", "tp", ""),
+            DispatchRow("n", "", "1", "1", "t", "tp", ""),
+        ],
+    )
+    def test_with_row_to_skip_returns_none(self, row, owner_nations, category_setups):
+        result = loader.parse_dispatch_cell_values_of_row(
+            row, "s", owner_nations, category_setups
+        )
+
+        assert result is None
+
     @pytest.mark.parametrize(
         "row,spreadsheet_id,expected",
         [
-            [DispatchRow("", "create", "1", "1", "t", "tp", ""), "s", SkipRow],
-            [DispatchRow("n", "", "1", "1", "t", "tp", ""), "s", SkipRow],
             [
                 DispatchRow("n", "a", "1", "1", "t", "tp", ""),
                 "s",
@@ -587,7 +812,7 @@ class TestParseDispatchCellValuesOfRows:
             rows, "s", owner_nations, category_setups, Mock()
         )
 
-        assert result == expected
+        assert dict(result) == expected
 
     def test_skip_row_logs_message(
         self, owner_nations, category_setups, caplog: pytest.LogCaptureFixture
@@ -595,18 +820,37 @@ class TestParseDispatchCellValuesOfRows:
         rows = [DispatchRow("n", "", "1", "1", "t", "tp", "")]
 
         with caplog.at_level(logging.DEBUG):
-            loader.parse_dispatch_cell_values_of_rows(
-                rows, "s", owner_nations, category_setups, Mock()
+            list(
+                loader.parse_dispatch_cell_values_of_rows(
+                    rows, "s", owner_nations, category_setups, Mock()
+                )
             )
 
+    def test_with_blank_rows_does_not_parse_them(
+        self, owner_nations, category_setups, caplog: pytest.LogCaptureFixture
+    ):
+        rows = [DispatchRow("", "", "", "", "", "", "")] * 3
+
+        with caplog.at_level(logging.DEBUG):
+            result = list(
+                loader.parse_dispatch_cell_values_of_rows(
+                    rows, "s", owner_nations, category_setups, Mock()
+                )
+            )
+
+        assert result == []
+        assert not caplog.records
+
     def test_with_invalid_row_logs_message(
         self, owner_nations, category_setups, caplog: pytest.LogCaptureFixture
     ):
         rows = [DispatchRow("n", "create", "", "", "", "", "")]
 
         with caplog.at_level(logging.ERROR):
-            loader.parse_dispatch_cell_values_of_rows(
-                rows, "s", owner_nations, category_setups, Mock()
+            list(
+                loader.parse_dispatch_cell_values_of_rows(
+                    rows, "s", owner_nations, category_setups, Mock()
+                )
             )
 
     def test_with_invalid_row_calls_report_failure_cb(
@@ -615,8 +859,10 @@ class TestParseDispatchCellValuesOfRows:
         rows = [DispatchRow("n", "create", "", "", "", "", "")]
         report_failure_cb = Mock()
 
-        loader.parse_dispatch_cell_values_of_rows(
-            rows, "s", owner_nations, category_setups, report_failure_cb
+        list(
+            loader.parse_dispatch_cell_values_of_rows(
+                rows, "s", owner_nations, category_setups, report_failure_cb
+            )
         )
 
         report_failure_cb.assert_called()
@@ -720,7 +966,68 @@ class TestParseDispatchCellValuesOfRanges:
         report_failure_cb.assert_called()
 
 
-class TestGenerateNewDispatchRangeCellValues:
+@pytest.mark.parametrize(
+    "dispatch_rows,expected",
+    [
+        [
+            {
+                SheetRange("s", "A!A1:F"): [
+                    DispatchRow("n1", "create", "1", "1", "t1", "tp1", ""),
+                    DispatchRow("", "", "", "", "", "", ""),
+                ],
+                SheetRange("s", "B!A1:F"): [
+                    DispatchRow(
+                        '=hyperlink("https://www.nationstates.net/page=dispatch/id=1","n2")',
+                        "edit",
+                        "1",
+                        "1",
+                        "t2",
+                        "tp2",
+                        "",
+                    ),
+                ],
+            },
+            {
+                "n1": [
+                    DispatchRowRef(SheetRange("s", "A!A1:F"), 0, "n1", "create", "")
+                ],
+                "n2": [
+                    DispatchRowRef(
+                        SheetRange("s", "B!A1:F"),
+                        0,
+                        '=hyperlink("https://www.nationstates.net/page=dispatch/id=1","n2")',
+                        "edit",
+                        "",
+                    )
+                ],
+            },
+        ],
+        [
+            {
+                SheetRange("s", "A!A1:F"): [
+                    DispatchRow("n", "create", "1", "1", "t1", "tp1", ""),
+                ],
+                SheetRange("s", "B!A1:F"): [
+                    DispatchRow("n", "edit", "1", "1", "t2", "tp2", "s"),
+                ],
+            },
+            {
+                "n": [
+                    DispatchRowRef(SheetRange("s", "A!A1:F"), 0, "n", "create", ""),
+                    DispatchRowRef(SheetRange("s", "B!A1:F"), 0, "n", "edit", "s"),
+                ]
+            },
+        ],
+        [{SheetRange("s", "A!A1:F"): []}, {}],
+    ],
+)
+def test_index_dispatch_rows_returns_row_refs(dispatch_rows, expected):
+    result = loader.index_dispatch_rows(dispatch_rows)
+
+    assert result == expected
+
+
+class TestGenerateNewDispatchRow:
     @pytest.mark.parametrize(
         "hyperlink, op, op_enum, expected_hyperlink, expected_op, expected_status",
         [
@@ -750,149 +1057,175 @@ class TestGenerateNewDispatchRangeCellValues:
             ],
         ],
     )
-    def test_with_succeed_ops_returns_updated_row_cell_values(
+    def test_with_succeed_op_returns_updated_row(
         self, hyperlink, op, op_enum, expected_hyperlink, expected_op, expected_status
     ):
-        old_rows = [DispatchRow(hyperlink, op, "1", "1", "t", "tp", "")]
-        dispatch_config = {
-            "n": Dispatch("1", op_enum, "nat", "t", "meta", "gameplay", "tp")
-        }
-        op_results = {"n": SuccessOpResult("n", op_enum, datetime(2023, 1, 1))}
+        old_row = DispatchRowRef(SheetRange("s", "A!A1:F"), 0, hyperlink, op, "")
+        dispatch = Dispatch("1", op_enum, "nat", "t", "meta", "gameplay", "tp")
+        op_result = SuccessOpResult("n", op_enum, datetime(2023, 1, 1))
 
-        result = loader.generate_new_dispatch_cell_values_of_range(
-            old_rows, dispatch_config, op_results
+        result = loader.generate_new_dispatch_row(
+            old_row, "n", dispatch, "1", op_result
         )
 
-        assert result == [
-            [expected_hyperlink, expected_op, "1", "1", "t", "tp", expected_status]
-        ]
+        assert result == DispatchRowRef(
+            SheetRange("s", "A!A1:F"),
+            0,
+            expected_hyperlink,
+            expected_op,
+            expected_status,
+        )
 
     @pytest.mark.parametrize(
-        "hyperlink,dispatch_config,op_results",
+        "dispatch",
         [
-            ["", {}, {}],
-            [
-                "n",
-                {
-                    "n": Dispatch(
-                        "1",
-                        DispatchOp.CREATE,
-                        "nat",
-                        "t",
-                        "meta",
-                        "gameplay",
-                        "tp",
-                    )
-                },
-                {},
-            ],
+            Dispatch("1", DispatchOp.CREATE, "nat", "t", "meta", "gameplay", "tp"),
+            None,
         ],
     )
-    def test_with_no_op_cases_returns_identical_row_cell_values(
-        self, hyperlink, dispatch_config, op_results
-    ):
-        old_rows = [DispatchRow(hyperlink, "create", "1", "1", "t", "tp", "")]
+    def test_with_failed_op_returns_identical_row_with_failed_status(self, dispatch):
+        old_row = DispatchRowRef(SheetRange("s", "A!A1:F"), 0, "n", "create", "")
+        op_result = FailureOpResult("n", DispatchOp.CREATE, datetime(2023, 1, 1), "d")
 
-        result = loader.generate_new_dispatch_cell_values_of_range(
-            old_rows, dispatch_config, op_results
+        result = loader.generate_new_dispatch_row(
+            old_row, "n", dispatch, None, op_result
         )
 
-        assert result == [
-            [
-                hyperlink,
-                "create",
-                "1",
-                "1",
-                "t",
-                "tp",
-                "",
-            ]
-        ]
+        assert result == DispatchRowRef(
+            SheetRange("s", "A!A1:F"),
+            0,
+            "n",
+            "create",
+            "Failed to create.\nDetails: d\nTime: 2023/01/01 00:00:00 ",
+        )
 
-    def test_with_failed_op_returns_identical_row_cell_values_with_failed_status(self):
-        old_rows = [DispatchRow("n", "create", "1", "1", "t", "tp", "")]
-        dispatch_config = {
-            "n": Dispatch("1", DispatchOp.CREATE, "nat", "t", "meta", "gameplay", "tp")
+
+class TestGenerateNewDispatchCellValuesForRanges:
+    def test_with_op_results_returns_updated_row_ranges(self):
+        row_index = loader.index_dispatch_rows(
+            {
+                SheetRange("s1", "A!A3:F"): [
+                    DispatchRow("", "", "", "", "", "", ""),
+                    DispatchRow("n1", "create", "1", "1", "t1", "tp1", ""),
+                ],
+                SheetRange("s2", "A!A1:F"): [
+                    DispatchRow("n2", "create", "1", "1", "t2", "tp2", "")
+                ],
+            }
+        )
+        dispatches = {
+            "n1": Dispatch(
+                None, DispatchOp.CREATE, "nat", "t1", "meta", "gameplay", "tp1"
+            ),
+            "n2": Dispatch(
+                None, DispatchOp.CREATE, "nat", "t2", "meta", "gameplay", "tp2"
+            ),
         }
+        new_dispatch_ids = {"n1": "1", "n2": "2"}
+        op_results = {
+            "n1": SuccessOpResult("n1", DispatchOp.CREATE, datetime(2023, 1, 1)),
+            "n2": SuccessOpResult("n2", DispatchOp.CREATE, datetime(2023, 1, 1)),
+        }
+
+        result = loader.generate_new_dispatch_cell_values_for_ranges(
+            row_index, dispatches, new_dispatch_ids, op_results
+        )
+
+        assert result == {
+            SheetRange("s1", "A!A4"): [
+                ['=hyperlink("https://www.nationstates.net/page=dispatch/id=1","n1")']
+            ],
+            SheetRange("s1", "A!B4"): [["edit"]],
+            SheetRange("s1", "A!G4"): [
+                ["Created successfully.\nTime: 2023/01/01 00:00:00 "]
+            ],
+            SheetRange("s2", "A!A1"): [
+                ['=hyperlink("https://www.nationstates.net/page=dispatch/id=2","n2")']
+            ],
+            SheetRange("s2", "A!B1"): [["edit"]],
+            SheetRange("s2", "A!G1"): [
+                ["Created successfully.\nTime: 2023/01/01 00:00:00 "]
+            ],
+        }
+
+    def test_with_failed_op_result_returns_only_status_cell(self):
+        row_index = loader.index_dispatch_rows(
+            {
+                SheetRange("s", "A!A1:F"): [
+                    DispatchRow("n", "create", "1", "1", "t", "tp", "")
+                ]
+            }
+        )
         op_results = {
             "n": FailureOpResult("n", DispatchOp.CREATE, datetime(2023, 1, 1), "d")
         }
 
-        result = loader.generate_new_dispatch_cell_values_of_range(
-            old_rows, dispatch_config, op_results
+        result = loader.generate_new_dispatch_cell_values_for_ranges(
+            row_index, {}, {}, op_results
         )
 
-        assert result == [
-            [
-                "n",
-                "create",
-                "1",
-                "1",
-                "t",
-                "tp",
-                "Failed to create.\nDetails: d\nTime: 2023/01/01 00:00:00 ",
+        assert result == {
+            SheetRange("s", "A!G1"): [
+                ["Failed to create.\nDetails: d\nTime: 2023/01/01 00:00:00 "]
             ]
-        ]
+        }
 
+    def test_with_similar_dispatch_names_returns_cells_of_all_rows(self):
+        row_index = loader.index_dispatch_rows(
+            {
+                SheetRange("s", "A!A1:F"): [
+                    DispatchRow("n", "edit", "1", "1", "t", "tp", ""),
+                    DispatchRow("n", "edit", "1", "1", "t", "tp", ""),
+                ]
+            }
+        )
+        dispatches = {
+            "n": Dispatch("1", DispatchOp.EDIT, "nat", "t", "meta", "gameplay", "tp")
+        }
+        op_results = {
+            "n": SuccessOpResult("n", DispatchOp.EDIT, datetime(2023, 1, 1)),
+        }
 
-@pytest.mark.parametrize(
-    "old_rows,expected_result",
-    [
+        result = loader.generate_new_dispatch_cell_values_for_ranges(
+            row_index, dispatches, {}, op_results
+        )
+
+        assert result == {
+            SheetRange("s", "A!G1"): [
+                ["Edited successfully.\nTime: 2023/01/01 00:00:00 "]
+            ],
+            SheetRange("s", "A!G2"): [
+                ["Edited successfully.\nTime: 2023/01/01 00:00:00 "]
+            ],
+        }
+
+    @pytest.mark.parametrize(
+        "hyperlink,op_results",
         [
-            {
-                SheetRange("s1", "A!A1:F"): [
-                    DispatchRow("n1", "create", "1", "1", "t1", "tp1", "")
-                ],
-                SheetRange("s2", "A!A1:F"): [
-                    DispatchRow("n2", "create", "1", "1", "t2", "tp2", "")
-                ],
-            },
-            {
-                SheetRange("s1", "A!A1:F"): [
-                    [
-                        '=hyperlink("https://www.nationstates.net/page=dispatch/id=1","n1")',
-                        "edit",
-                        "1",
-                        "1",
-                        "t1",
-                        "tp1",
-                        "Created successfully.\nTime: 2023/01/01 00:00:00 ",
-                    ]
-                ],
-                SheetRange("s2", "A!A1:F"): [
-                    [
-                        '=hyperlink("https://www.nationstates.net/page=dispatch/id=2","n2")',
-                        "edit",
-                        "1",
-                        "1",
-                        "t2",
-                        "tp2",
-                        "Created successfully.\nTime: 2023/01/01 00:00:00 ",
-                    ]
-                ],
-            },
+            ["n", {}],
+            [
+                "",
+                {"n": SuccessOpResult("n", DispatchOp.CREATE, datetime(2023, 1, 1))},
+            ],
         ],
-        [{SheetRange("s1", "A!A1:F"): []}, {SheetRange("s1", "A!A1:F"): []}],
-        [{}, {}],
-    ],
-)
-def test_generate_new_dispatch_cell_values_for_ranges_returns_updated_cell_values(
-    old_rows, expected_result
-):
-    dispatch_config = {
-        "n1": Dispatch("1", DispatchOp.CREATE, "nat", "t1", "meta", "gameplay", "tp1"),
-        "n2": Dispatch("2", DispatchOp.CREATE, "nat", "t2", "meta", "gameplay", "tp2"),
-    }
-    op_results = {
-        "n1": SuccessOpResult("n1", DispatchOp.CREATE, datetime(2023, 1, 1)),
-        "n2": SuccessOpResult("n2", DispatchOp.CREATE, datetime(2023, 1, 1)),
-    }
-
-    result = loader.generate_new_dispatch_cell_values_for_ranges(
-        old_rows, dispatch_config, op_results
     )
+    def test_with_no_op_cases_returns_no_cell_values(self, hyperlink, op_results):
+        row_index = loader.index_dispatch_rows(
+            {
+                SheetRange("s", "A!A1:F"): [
+                    DispatchRow(hyperlink, "create", "1", "1", "t", "tp", "")
+                ]
+            }
+        )
+        dispatches = {
+            "n": Dispatch("1", DispatchOp.CREATE, "nat", "t", "meta", "gameplay", "tp")
+        }
+
+        result = loader.generate_new_dispatch_cell_values_for_ranges(
+            row_index, dispatches, {"n": "1"}, op_results
+        )
 
-    assert result == expected_result
+        assert result == {}
 
 
 class TestDispatchConfigStore:
@@ -970,7 +1303,7 @@ class TestDispatchConfigStore:
             obj.get_dispatch_template("something non existent")
 
     @pytest.mark.parametrize("old_dispatch_id,expected", [[None, "1"], ["0", "1"]])
-    def test_add_dispatch_id_adds_id_into_dispatch(self, old_dispatch_id, expected):
+    def test_add_dispatch_id_updates_dispatch_metadata(self, old_dispatch_id, expected):
         dispatch_data = {
             "n": Dispatch(
                 ns_id=old_dispatch_id,
@@ -985,10 +1318,55 @@ class TestDispatchConfigStore:
         obj = loader.DispatchStore(dispatch_data)
 
         obj.add_dispatch_id("n", "1")
-        result = obj["n"].ns_id
+        result = obj.get_dispatches_metadata()["n"].ns_id
 
         assert result == expected
 
+    def test_add_dispatch_id_after_getting_metadata_updates_dispatch_metadata(self):
+        dispatch_data = {
+            "n": Dispatch(
+                ns_id=None,
+                owner_nation="nat",
+                operation=DispatchOp.CREATE,
+                title="t",
+                template="tp",
+                category="meta",
+                subcategory="gameplay",
+            )
+        }
+        obj = loader.DispatchStore(dispatch_data)
+        obj.get_dispatches_metadata()
+
+        obj.add_dispatch_id("n", "1")
+        result = obj.get_dispatches_metadata()["n"].ns_id
+
+        assert result == "1"
+
+    def test_change_returned_metadata_does_not_change_cached_metadata(self):
+        dispatch_data = {
+            "n": Dispatch(
+                ns_id="1",
+                owner_nation="nat",
+                operation=DispatchOp.EDIT,
+                title="t",
+                template="tp",
+                category="meta",
+                subcategory="gameplay",
+            )
+        }
+        obj = loader.DispatchStore(dispatch_data)
+
+        obj.get_dispatches_metadata().clear()
+        result = obj.get_dispatches_metadata()
+
+        assert list(result) == ["n"]
+
+    def test_add_id_of_non_existent_dispatch_raises_exception(self):
+        obj = loader.DispatchStore({})
+
+        with pytest.raises(KeyError):
+            obj.add_dispatch_id("n", "1")
+
 
 @pytest.mark.parametrize(
     "config,expected",
@@ -1017,14 +1395,17 @@ class TestDispatchConfigStore:
 def test_flatten_dispatch_sheet_config_returns_flatten_list(config, expected):
     result = loader.flatten_spreadsheet_config(config)
 
-    assert result == expected
+    assert list(result) == expected
 
 
 class TestGoogleDispatchLoader:
     @pytest.fixture(scope="class")
     def loader_obj(self):
         owner_nations = loader.OwnerNationStore(
-            {"1": OwnerNation("nat1", ["s"]), "2": OwnerNation("nat2", ["s"])}
+            {
+                "1": OwnerNation("nat1", frozenset(["s"])),
+                "2": OwnerNation("nat2", frozenset(["s"])),
+            }
         )
         category_setups = loader.CategorySetupStore(
             {"1": CategorySetup("meta", "gameplay")}
@@ -1067,7 +1448,7 @@ class TestGoogleDispatchLoader:
 
         return loader.GoogleDispatchLoader(
             Mock(),
-            dispatch_ranges,
+            loader.index_dispatch_rows(dispatch_ranges),
             dispatches,
             utility_templates,
             owner_nations,
@@ -1100,10 +1481,24 @@ class TestGoogleDispatchLoader:
 
         assert result == "tp1"
 
+    def test_get_template_of_name_used_by_both_kinds_returns_utility_template(self):
+        dispatches = loader.DispatchStore(
+            {"n": Dispatch("1", DispatchOp.EDIT, "nat", "t", "meta", "gameplay", "tp")}
+        )
+        obj = loader.GoogleDispatchLoader(
+            Mock(), {}, dispatches, {"n": "utp"}, Mock(), Mock(), Mock()
+        )
+
+        result = obj.get_dispatch_template("n")
+
+        assert result == "utp"
+
     def test_update_spreadsheets_after_new_dispatch_created_changes_op_to_edit(
         self,
     ):
-        owner_nations = loader.OwnerNationStore({"1": OwnerNation("nat", ["s"])})
+        owner_nations = loader.OwnerNationStore(
+            {"1": OwnerNation("nat", frozenset(["s"]))}
+        )
         category_setups = loader.CategorySetupStore(
             {"1": CategorySetup("meta", "gameplay")}
         )
@@ -1121,7 +1516,7 @@ class TestGoogleDispatchLoader:
         op_result_store = loader.OpResultStore()
         obj = loader.GoogleDispatchLoader(
             sheets_api,
-            dispatch_ranges,
+            loader.index_dispatch_rows(dispatch_ranges),
             dispatches,
             utility_templates,
             owner_nations,
@@ -1138,24 +1533,23 @@ class TestGoogleDispatchLoader:
 
         obj.update_spreadsheets()
 
-        new_range = [
-            [
-                '=hyperlink("https://www.nationstates.net/page=dispatch/id=1","n")',
-                "edit",
-                "1",
-                "1",
-                "t",
-                "tp",
-                "Created successfully.\nTime: 2023/01/01 00:00:00 ",
-            ]
-        ]
-        new_spreadsheets = {loader.SheetRange("s", "A!A1:F"): new_range}
+        new_spreadsheets = {
+            loader.SheetRange("s", "A!A1"): [
+                ['=hyperlink("https://www.nationstates.net/page=dispatch/id=1","n")']
+            ],
+            loader.SheetRange("s", "A!B1"): [["edit"]],
+            loader.SheetRange("s", "A!G1"): [
+                ["Created successfully.\nTime: 2023/01/01 00:00:00 "]
+            ],
+        }
         sheets_api.update_values_of_ranges.assert_called_with(new_spreadsheets)
 
     def test_update_spreadsheets_after_nsdu_failure_report_updates_status_with_failure(
         self,
     ):
-        owner_nations = loader.OwnerNationStore({"1": OwnerNation("nat", ["s"])})
+        owner_nations = loader.OwnerNationStore(
+            {"1": OwnerNation("nat", frozenset(["s"]))}
+        )
         category_setups = loader.CategorySetupStore(
             {"1": CategorySetup("meta", "gameplay")}
         )
@@ -1173,7 +1567,7 @@ class TestGoogleDispatchLoader:
         op_result_store = loader.OpResultStore()
         obj = loader.GoogleDispatchLoader(
             sheets_api,
-            dispatch_ranges,
+            loader.index_dispatch_rows(dispatch_ranges),
             dispatches,
             utility_templates,
             owner_nations,
@@ -1190,16 +1584,43 @@ class TestGoogleDispatchLoader:
 
         obj.update_spreadsheets()
 
-        new_range = [
-            [
-                "n",
-                "create",
-                "1",
-                "1",
-                "t",
-                "tp",
-                "Failed to create.\nDetails: d\nTime: 2023/01/01 00:00:00 ",
+        new_spreadsheets = {
+            loader.SheetRange("s", "A!G1"): [
+                ["Failed to create.\nDetails: d\nTime: 2023/01/01 00:00:00 "]
             ]
-        ]
-        new_spreadsheets = {loader.SheetRange("s", "A!A1:F"): new_range}
+        }
         sheets_api.update_values_of_ranges.assert_called_with(new_spreadsheets)
+
+    def test_update_spreadsheets_without_results_makes_no_api_call(self):
+        range_1_rows = [DispatchRow("n", "create", "1", "1", "t", "tp", "")]
+        dispatch_ranges = {SheetRange("s", "A!A1:F"): range_1_rows}
+        sheets_api = mock.create_autospec(loader.GoogleSheetsApiAdapter)
+        obj = loader.GoogleDispatchLoader(
+            sheets_api,
+            loader.index_dispatch_rows(dispatch_ranges),
+            loader.DispatchStore(),
+            {},
+            loader.OwnerNationStore(),
+            loader.CategorySetupStore(),
+            loader.OpResultStore(),
+        )
+
+        obj.update_spreadsheets()
+
+        sheets_api.update_values_of_ranges.assert_not_called()
+
+    def test_cleanup_dispatch_loader_closes_api_adapter(self):
+        sheets_api = mock.create_autospec(loader.GoogleSheetsApiAdapter)
+        obj = loader.GoogleDispatchLoader(
+            sheets_api,
+            {},
+            loader.DispatchStore(),
+            {},
+            loader.OwnerNationStore(),
+            loader.CategorySetupStore(),
+            loader.OpResultStore(),
+        )
+
+        loader.cleanup_dispatch_loader(obj)
+
+        sheets_api.close.assert_called_once()
@@ -1,4 +1,6 @@
 import json
+import os
+import stat
 from unittest import mock
 
 import pytest
@@ -82,3 +84,56 @@ class TestJSONLoader:
 
         with pytest.raises(loader_api.CredNotFound):
             loader.remove_cred(obj, "a")
+
+    def test_save_creds_leaves_no_temp_file(self, tmp_path):
+        cred_file_path = tmp_path / "cred.json"
+        config = {"json_cred_loader": {"cred_path": cred_file_path}}
+        obj = loader.init_cred_loader(config)
+
+        loader.add_cred(obj, "nat", "a")
+        loader.cleanup_cred_loader(obj)
+
+        assert list(tmp_path.iterdir()) == [cred_file_path]
+
+    def test_add_existing_cred_does_not_save_file(self, cred_file):
+        config = {"json_cred_loader": {"cred_path": cred_file}}
+        obj = loader.init_cred_loader(config)
+
+        with mock.patch("os.replace") as replace:
+            loader.add_cred(obj, "nat1", "a1")
+            loader.cleanup_cred_loader(obj)
+
+        replace.assert_not_called()
+
+    @pytest.mark.parametrize("file_mode", [0o600, 0o640])
+    def test_save_creds_keeps_file_mode(self, cred_file, file_mode):
+        os.chmod(cred_file, file_mode)
+        config = {"json_cred_loader": {"cred_path": cred_file}}
+        obj = loader.init_cred_loader(config)
+
+        loader.add_cred(obj, "nat3", "a3")
+        loader.cleanup_cred_loader(obj)
+
+        assert stat.S_IMODE(os.stat(cred_file).st_mode) == file_mode
+
+    def test_save_new_creds_file_is_only_readable_by_owner(self, tmp_path):
+        cred_file_path = tmp_path / "cred.json"
+        config = {"json_cred_loader": {"cred_path": cred_file_path}}
+        obj = loader.init_cred_loader(config)
+
+        loader.add_cred(obj, "nat", "a")
+        loader.cleanup_cred_loader(obj)
+
+        assert stat.S_IMODE(os.stat(cred_file_path).st_mode) == 0o600
+
+    def test_save_creds_with_failed_write_removes_temp_file(self, tmp_path):
+        cred_file_path = tmp_path / "cred.json"
+        config = {"json_cred_loader": {"cred_path": cred_file_path}}
+        obj = loader.init_cred_loader(config)
+        loader.add_cred(obj, "nat", "a")
+
+        with mock.patch("os.replace", side_effect=OSError):
+            with pytest.raises(OSError):
+                loader.cleanup_cred_loader(obj)
+
+        assert list(tmp_path.iterdir()) == []
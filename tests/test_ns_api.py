@@ -29,6 +29,13 @@ class TestParseRespForNewDispatchId:
             ns_api.parse_resp_for_new_dispatch_id("")
 
 
+def test_get_original_api_with_same_user_agent_returns_shared_client():
+    result = ns_api.get_original_api("a")
+
+    assert result is ns_api.get_original_api("a")
+    assert ns_api.AuthApi("a").original_api is ns_api.DispatchApi("a").original_api
+
+
 def mock_orig_api(
     return_value: dict | None = None, side_effect: Exception | None = None
 ) -> nationstates.Nationstates:
@@ -81,6 +88,21 @@ class TestAuthApi:
 
         assert not result
 
+    def test_verify_autologin_codes_returns_result_of_each_nation(self, auth_api):
+        api = auth_api()
+        api.verify_autologin_code = Mock(side_effect=lambda name, code: code == "1")
+
+        result = api.verify_autologin_codes({"nat1": "1", "nat2": "2"})
+
+        assert result == {"nat1": True, "nat2": False}
+
+    def test_verify_no_autologin_codes_returns_empty_dict(self, auth_api):
+        api = auth_api()
+
+        result = api.verify_autologin_codes({})
+
+        assert result == {}
+
 
 class TestDispatchApi:
     def test_create_dispatch_calls_original_api_and_returns_new_dispatch_id(self):
@@ -166,3 +166,17 @@ class TestDispatchRenderer:
         result = obj.render("t")
 
         assert result == "[cr2]ctx=bar fA-1[/cr2]"
+
+    def test_render_provides_current_dispatch_name_without_changing_template_vars(
+        self,
+    ):
+        template_load_func = Mock(return_value="{{ current_dispatch_name }}")
+        template_vars = {"i": 1}
+        obj = renderer.DispatchRenderer(
+            template_load_func, None, None, None, template_vars
+        )
+
+        result = obj.render("t")
+
+        assert result == "t"
+        assert obj.global_context == {"i": 1}